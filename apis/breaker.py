@@ -0,0 +1,95 @@
+import math
+import os
+import time
+from typing import Dict
+
+
+# 연속 실패가 이 횟수에 도달하면 회로를 열고, RESET_TIMEOUT초 뒤 half-open 상태에서 시험 요청을 보냄
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.environ.get("BREAKER_RESET_TIMEOUT", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """provider 회로가 열려 있어 요청을 보내지 않고 바로 실패할 때 발생합니다."""
+
+
+class CircuitBreaker:
+    """
+    provider 하나의 회로 차단기입니다.
+    연속된 연결 오류/타임아웃/5xx 응답이 threshold번 이어지면 회로를 열어 요청을 즉시 실패시키고,
+    reset_timeout초가 지나면 half-open 상태에서 시험 요청 하나만 통과시켜 성공하면 다시 닫습니다.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT
+    ):
+        self.provider = provider
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        # half-open 시험 요청이 끝나지 않은 채 취소되어도 회로가 멈추지 않도록 시험 기회에 만료 시간을 둠
+        self._probe_until = 0.0
+        self.counters = {"opened": 0, "rejected": 0}
+
+    def before_request(self) -> None:
+        """
+        요청을 보내도 되는지 확인합니다.
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있거나 half-open 시험 요청이 이미 진행 중인 경우
+        """
+        if self.state == CLOSED:
+            return
+        now = time.monotonic()
+        if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and now >= self._probe_until:
+            self._probe_until = now + self.reset_timeout
+            return
+        self.counters["rejected"] += 1
+        retry_in = max(1, math.ceil(self.reset_timeout - (now - self.opened_at)))
+        raise CircuitOpenError(
+            f"{self.provider} 요청이 연속으로 실패하여 잠시 차단되었습니다 (약 {retry_in}초 후 재시도)."
+        )
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._probe_until = 0.0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.threshold:
+            if self.state != OPEN:
+                self.counters["opened"] += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self._probe_until = 0.0
+
+    def stats(self) -> Dict[str, object]:
+        return {"state": self.state, "failures": self.failures, **self.counters}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """provider별로 공유되는 CircuitBreaker를 반환합니다."""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        breaker = _breakers[provider] = CircuitBreaker(provider)
+    return breaker
+
+
+def stats() -> Dict[str, Dict[str, object]]:
+    """provider별 회로 상태와 카운터를 반환합니다."""
+    return {provider: breaker.stats() for provider, breaker in _breakers.items()}
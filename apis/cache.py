@@ -0,0 +1,197 @@
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from apis.geocache import normalize_query
+
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_DEFAULT_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "300"))
+RESPONSE_CACHE_STALE_TTL = float(os.environ.get("RESPONSE_CACHE_STALE_TTL", "600"))
+# 경로는 교통 상황에 따라 바뀌므로 짧게 유지하고 stale 응답도 반환하지 않습니다.
+ROUTE_CACHE_TTL = float(os.environ.get("ROUTE_CACHE_TTL", "120"))
+ROUTE_CACHE_MAX_BYTES = int(os.environ.get("ROUTE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# 엔드포인트별 TTL (초). 업체 정보는 자주 바뀌지 않으므로 더 길게 유지합니다.
+ENDPOINT_TTLS = {
+    ("naver", "blog"): RESPONSE_CACHE_DEFAULT_TTL,
+    ("naver", "local"): 3600.0,
+    ("naver", "webkr"): RESPONSE_CACHE_DEFAULT_TTL,
+    ("kakao", "keyword"): 3600.0,
+    ("kakao", "address"): 86400.0,
+    ("kakao", "web"): RESPONSE_CACHE_DEFAULT_TTL,
+    ("google", "customsearch"): 1800.0,
+    # YouTube 검색은 요청당 100 quota unit이 드므로 길게 유지합니다.
+    ("youtube", "search"): 3600.0,
+    ("kakao", "directions"): ROUTE_CACHE_TTL,
+}
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, Hashable], ...]]
+
+
+def _normalize_value(value: Any) -> Hashable:
+    if isinstance(value, str):
+        return normalize_query(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize_value(item) for item in value)
+    if isinstance(value, dict):
+        return normalize_params(value)
+    return value
+
+
+def normalize_params(params: Dict[str, Any]) -> Tuple[Tuple[str, Hashable], ...]:
+    """캐시 키로 사용할 수 있도록 요청 파라미터를 정규화합니다."""
+    return tuple(sorted(
+        (name, _normalize_value(value)) for name, value in params.items()
+    ))
+
+
+class _Entry:
+    __slots__ = ("value", "size", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, size: int, fresh_until: float, stale_until: float):
+        self.value = value
+        self.size = size
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class ResponseCache:
+    """
+    provider 응답을 위한 TTL 캐시입니다.
+    TTL이 지난 항목은 stale 기간 동안 즉시 반환하고 백그라운드에서 갱신합니다(stale-while-revalidate).
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+        stale_ttl: float = RESPONSE_CACHE_STALE_TTL,
+    ):
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._refreshing: Set[CacheKey] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0}
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        ttl = ENDPOINT_TTLS.get(key[:2], RESPONSE_CACHE_DEFAULT_TTL)
+        size = len(value) if isinstance(value, (str, bytes)) else len(repr(value))
+        now = time.monotonic()
+        self._discard(key)
+        self._entries[key] = _Entry(value, size, now + ttl, now + ttl + self.stale_ttl)
+        self._bytes += size
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.counters["evictions"] += 1
+
+    def _discard(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    async def _refresh(self, key: CacheKey, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self._store(key, await fetch())
+            self.counters["refreshes"] += 1
+        except Exception as e:
+            logger.warning("Background refresh failed for %s/%s: %s", key[0], key[1], e)
+        finally:
+            self._refreshing.discard(key)
+
+    async def get_or_fetch(
+        self,
+        provider: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        캐시된 응답을 반환하거나, 없으면 fetch를 호출해 응답을 가져와 저장합니다.
+
+        Args:
+            provider (str): provider 이름
+            endpoint (str): 엔드포인트 이름
+            params (Dict[str, Any]): 요청 파라미터
+            fetch (Callable): 실제 요청을 수행하는 코루틴 함수
+
+        Returns:
+            Any: 응답 값
+        """
+        key = (provider, endpoint, normalize_params(params))
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now < entry.stale_until:
+            self._entries.move_to_end(key)
+            if now < entry.fresh_until:
+                self.counters["hits"] += 1
+            else:
+                self.counters["stale_hits"] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    task = asyncio.create_task(self._refresh(key, fetch))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            return entry.value
+
+        self.counters["misses"] += 1
+        value = await fetch()
+        self._store(key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중/실패 카운터와 현재 크기를 반환합니다."""
+        lookups = self.counters["hits"] + self.counters["stale_hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": (lookups - self.counters["misses"]) / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def clear(self) -> None:
+        """모든 캐시 항목을 삭제합니다."""
+        self._entries.clear()
+        self._bytes = 0
+
+
+response_cache = ResponseCache()
+route_cache = ResponseCache(max_bytes=ROUTE_CACHE_MAX_BYTES, stale_ttl=0.0)
+
+
+def cached(provider: str, endpoint: str, cache: Optional[ResponseCache] = None):
+    """
+    provider 검색 함수의 응답을 ResponseCache에 저장하는 데코레이터입니다.
+    함수 인자(기본값 포함)를 정규화하여 캐시 키로 사용합니다.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not RESPONSE_CACHE_ENABLED:
+                return await func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return await (cache or response_cache).get_or_fetch(
+                provider,
+                endpoint,
+                bound.arguments,
+                lambda: func(*args, **kwargs),
+            )
+
+        return wrapper
+
+    return decorator
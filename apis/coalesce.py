@@ -0,0 +1,78 @@
+import asyncio
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from apis.cache import normalize_params
+
+
+class SingleFlight:
+    """
+    동일한 요청(provider, 엔드포인트, 파라미터)이 동시에 들어오면
+    하나의 upstream 요청만 보내고 모든 호출자가 그 결과를 공유하게 합니다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Tuple[str, str, Hashable], asyncio.Task] = {}
+        self.counters = {"leaders": 0, "followers": 0}
+
+    async def do(
+        self,
+        provider: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        진행 중인 동일 요청이 있으면 그 결과를 기다리고, 없으면 fetch를 실행합니다.
+        한 호출자가 취소되어도 공유 요청은 취소되지 않습니다.
+
+        Args:
+            provider (str): provider 이름
+            endpoint (str): 엔드포인트 이름
+            params (Dict[str, Any]): 요청 파라미터
+            fetch (Callable): 실제 요청을 수행하는 코루틴 함수
+
+        Returns:
+            Any: 응답 값
+        """
+        key = (provider, endpoint, normalize_params(params))
+        task = self._inflight.get(key)
+        if task is None:
+            self.counters["leaders"] += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.counters["followers"] += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        """요청 병합 카운터와 현재 진행 중인 요청 수를 반환합니다."""
+        return {**self.counters, "inflight": len(self._inflight)}
+
+
+single_flight = SingleFlight()
+
+
+def coalesced(provider: str, endpoint: str):
+    """
+    동시에 호출된 동일한 provider 요청을 하나로 병합하는 데코레이터입니다.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return await single_flight.do(
+                provider,
+                endpoint,
+                bound.arguments,
+                lambda: func(*args, **kwargs),
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from apis import geometry, kakao, schema
+
+
+CORRIDOR_CONCURRENCY = int(os.environ.get("CORRIDOR_CONCURRENCY", "6"))
+# 한 번에 검색할 최대 샘플 수. 경로를 덮는 데 더 많은 샘플이 필요하면 출발지부터 이만큼만 검색합니다.
+CORRIDOR_MAX_SAMPLES = int(os.environ.get("CORRIDOR_MAX_SAMPLES", "100"))
+# 샘플마다 요청할 최대 결과 페이지 수 (카카오 로컬 API는 페이지당 15개, 최대 3페이지)
+CORRIDOR_MAX_PAGES = int(os.environ.get("CORRIDOR_MAX_PAGES", "3"))
+
+# 카카오 로컬 API의 최대 검색 반경 (미터)과 페이지 크기
+KAKAO_MAX_RADIUS_M = 20000
+KAKAO_PAGE_SIZE = 15
+# 샘플 간격 = corridor_m x 이 값. 검색 반경은 샘플 사이 중간 지점에서도 경로 양옆 corridor_m을 덮도록 정합니다.
+SAMPLE_INTERVAL_RATIO = 1.2
+
+# 자주 쓰는 경유지 종류와 카카오 카테고리 그룹 코드
+CATEGORY_ALIASES = {
+    "gas_station": "OL7",
+    "주유소": "OL7",
+    "restaurant": "FD6",
+    "음식점": "FD6",
+    "cafe": "CE7",
+    "카페": "CE7",
+    "convenience_store": "CS2",
+    "편의점": "CS2",
+    "parking": "PK6",
+    "주차장": "PK6",
+    "hospital": "HP8",
+    "병원": "HP8",
+    "pharmacy": "PM9",
+    "약국": "PM9",
+    "lodging": "AD5",
+    "숙박": "AD5",
+    "attraction": "AT4",
+    "관광명소": "AT4",
+}
+
+
+def route_polyline(route: Dict[str, Any]) -> np.ndarray:
+    """정제된 경로(kakao.refine_route 결과)의 모든 구간 좌표를 하나의 배열로 이어 붙입니다."""
+    coordinates = [
+        point
+        for section in route.get("sections", [])
+        for point in section.get("geometry", [])
+    ]
+    return np.asarray(coordinates, dtype=float).reshape(-1, 2)
+
+
+async def search_along_route(
+    lonlat: np.ndarray,
+    query: Optional[str] = None,
+    category: Optional[str] = None,
+    corridor_m: float = 1000.0,
+    max_stops: int = 20
+) -> Dict[str, Any]:
+    """
+    경로를 따라 샘플링한 지점마다 카카오 키워드/카테고리 검색을 동시에 수행하고,
+    경로에서 corridor_m 이내의 장소만 우회 거리 순으로 반환합니다.
+
+    샘플 간격은 corridor_m에 비례하고(SAMPLE_INTERVAL_RATIO), 검색 반경은 샘플 사이 중간 지점에서도
+    경로 양옆 corridor_m을 덮습니다. 결과가 한 페이지를 채우면 다음 페이지를 이어서 요청하며(최대 CORRIDOR_MAX_PAGES),
+    샘플이 CORRIDOR_MAX_SAMPLES개를 넘으면 간격을 넓히지 않고 출발지부터 그만큼만 검색한 뒤 searched_m으로 알립니다.
+
+    Args:
+        lonlat (np.ndarray): 경로 경위도 배열 (N x 2)
+        query (str, optional): 검색 키워드 (예: "휴게소")
+        category (str, optional): 카카오 카테고리 그룹 코드 또는 별칭 (예: "OL7", "주유소")
+        corridor_m (float): 경로에서 허용하는 최대 거리 (미터)
+        max_stops (int): 반환할 최대 장소 수
+
+    Returns:
+        Dict[str, Any]: stops(장소 정보와 detour_m(왕복 우회 거리), along_m(출발지부터 경로상 거리)),
+            searched_m(출발지부터 검색한 경로 거리), route_m(전체 경로 거리)
+    """
+    if len(lonlat) < 2 or not (query or category):
+        return {"stops": [], "searched_m": 0, "route_m": 0}
+
+    # 검색 반경이 카카오 최대 반경을 넘지 않는 범위에서 corridor_m을 사용합니다.
+    corridor_m = min(corridor_m, KAKAO_MAX_RADIUS_M / np.hypot(1.0, SAMPLE_INTERVAL_RATIO / 2))
+    interval_m = corridor_m * SAMPLE_INTERVAL_RATIO
+    radius_m = int(np.ceil(np.hypot(corridor_m, interval_m / 2)))
+    total_m = float(geometry.cumulative_lengths(lonlat)[-1])
+    samples = geometry.sample_polyline(lonlat, interval_m)
+    searched_m = total_m
+    if len(samples) > CORRIDOR_MAX_SAMPLES:
+        samples = samples[:CORRIDOR_MAX_SAMPLES]
+        searched_m = (CORRIDOR_MAX_SAMPLES - 0.5) * interval_m
+    category_code = CATEGORY_ALIASES.get(category, category) if category else None
+
+    semaphore = asyncio.Semaphore(CORRIDOR_CONCURRENCY)
+
+    async def search_sample(x: float, y: float) -> List[schema.LocalPlace]:
+        places: List[schema.LocalPlace] = []
+        for page in range(1, CORRIDOR_MAX_PAGES + 1):
+            async with semaphore:
+                if query:
+                    response_text = await kakao.search_local_kakao(query, x, y, radius_m, page)
+                else:
+                    response_text = await kakao.search_category_kakao(category_code, x, y, radius_m, page)
+            found = schema.parse_kakao_local(response_text)
+            places += found
+            # 결과가 한 페이지보다 적거나 마지막 페이지이면 샘플 반경 안의 장소를 모두 받은 것입니다.
+            if len(found) < KAKAO_PAGE_SIZE or json.loads(response_text).get("meta", {}).get("is_end", True):
+                break
+        return places
+
+    results = await asyncio.gather(
+        *(search_sample(round(x, 6), round(y, 6)) for x, y in samples),
+        return_exceptions=True,
+    )
+
+    failures = [result for result in results if isinstance(result, BaseException)]
+    if failures and len(failures) == len(results):
+        raise failures[0]
+
+    # 같은 장소는 여러 샘플 원에서 반복해서 나오므로 place_url(장소 ID)로 중복을 제거합니다.
+    unique: Dict[str, schema.LocalPlace] = {}
+    for result in results:
+        if isinstance(result, BaseException):
+            continue
+        for place in result:
+            if place.lat is None or place.lon is None:
+                continue
+            unique.setdefault(place.url or f"{place.name}@{place.lat},{place.lon}", place)
+
+    coverage = {"searched_m": int(round(min(searched_m, total_m))), "route_m": int(round(total_m))}
+    if not unique:
+        return {"stops": [], **coverage}
+
+    places = list(unique.values())
+    points = np.array([[place.lon, place.lat] for place in places])
+    # 단순화하지 않은 긴 경로에서는 투영 계산이 오래 걸리므로 이벤트 루프 밖에서 실행합니다.
+    distances, along = await asyncio.get_running_loop().run_in_executor(
+        None, geometry.project_onto_polyline, points, lonlat
+    )
+
+    stops = []
+    for index in np.argsort(distances):
+        if distances[index] > corridor_m or len(stops) >= max_stops:
+            break
+        stop = schema.to_dict(places[index])
+        stop["detour_m"] = int(round(distances[index] * 2))
+        stop["along_m"] = int(round(along[index]))
+        stops.append(stop)
+    return {"stops": stops, **coverage}
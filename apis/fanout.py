@@ -0,0 +1,88 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+# provider별 응답 마감 시간 (초)
+DEFAULT_PROVIDER_DEADLINE = float(os.environ.get("PROVIDER_DEADLINE", "8"))
+PROVIDER_DEADLINES = {
+    provider: float(os.environ.get(f"{provider.upper()}_DEADLINE", DEFAULT_PROVIDER_DEADLINE))
+    for provider in ("naver", "kakao", "google", "youtube")
+}
+
+# 일괄 검색(search_batch)에서 동시에 실행할 검색어 수와 한 번에 받을 수 있는 최대 검색어 수
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_QUERIES = int(os.environ.get("BATCH_MAX_QUERIES", "50"))
+
+
+async def _run_with_deadline(
+    call: Awaitable[Any],
+    deadline: float
+) -> Dict[str, Any]:
+    """
+    단일 provider 호출을 마감 시간 안에서 실행하고 상태를 포함한 결과를 반환합니다.
+    """
+    try:
+        result = await asyncio.wait_for(call, deadline)
+        return {"status": "ok", "result": result}
+    except asyncio.TimeoutError:
+        return {"status": "timeout", "error": f"{deadline:g}초 안에 응답하지 않았습니다."}
+    except Exception as e:
+        return {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+
+async def gather_providers(
+    calls: Dict[str, Awaitable[Any]],
+    deadlines: Optional[Dict[str, float]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 provider 호출을 동시에 실행하고, 마감 시간 안에 끝난 결과만 모아 반환합니다.
+    한 provider의 실패나 지연이 다른 provider의 결과를 버리지 않습니다.
+
+    Args:
+        calls (Dict[str, Awaitable]): provider 이름과 호출 코루틴
+        deadlines (Dict[str, float], optional): provider별 마감 시간 (초)
+
+    Returns:
+        Dict[str, Dict[str, Any]]: provider별 {"status", "result" 또는 "error"} 딕셔너리
+    """
+    deadlines = {**PROVIDER_DEADLINES, **(deadlines or {})}
+    providers = list(calls)
+    outcomes = await asyncio.gather(*(
+        _run_with_deadline(
+            calls[provider],
+            deadlines.get(provider, DEFAULT_PROVIDER_DEADLINE),
+        )
+        for provider in providers
+    ))
+    return dict(zip(providers, outcomes))
+
+
+async def gather_batch(
+    calls: Dict[str, Callable[[], Awaitable[Any]]],
+    concurrency: int = BATCH_CONCURRENCY
+) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 작업을 최대 concurrency개씩 동시에 실행하고, 작업별 결과를 따로 담아 반환합니다.
+    한 작업의 실패가 다른 작업의 결과를 버리지 않습니다.
+    코루틴은 실행 차례가 되었을 때 만들도록 인자 없는 함수로 받습니다.
+
+    Args:
+        calls (Dict[str, Callable]): 작업 이름과 코루틴을 만드는 함수
+        concurrency (int): 동시에 실행할 작업 수
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 작업별 {"status", "result" 또는 "error"} 딕셔너리
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(call: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return {"status": "ok", "result": await call()}
+            except Exception as e:
+                return {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    keys = list(calls)
+    outcomes = await asyncio.gather(*(run(calls[key]) for key in keys))
+    return dict(zip(keys, outcomes))
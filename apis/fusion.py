@@ -0,0 +1,147 @@
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from apis.schema import LocalPlace
+
+
+# 같은 장소로 볼 수 있는 최대 거리(미터)와 이름 유사도
+FUSION_RADIUS_M = 150.0
+FUSION_NAME_SIMILARITY = 0.8
+
+_MERGED_FIELDS = ("name", "address", "road_address", "phone", "category", "lat", "lon", "url")
+_NAME_NOISE = re.compile(r"[\s\W_]+")
+_METERS_PER_DEGREE = 111_320.0
+
+
+@dataclass(slots=True)
+class FusedPlace:
+    name: Optional[str]
+    address: Optional[str] = None
+    road_address: Optional[str] = None
+    phone: Optional[str] = None
+    category: Optional[str] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    url: Optional[str] = None
+    sources: List[str] = field(default_factory=list)
+    # provider별로 병합 값과 다른 속성 (예: {"naver": {"category": "카페,디저트"}})
+    variants: Dict[str, Dict[str, object]] = field(default_factory=dict)
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """공백, 문장부호를 제거하고 소문자로 바꾼 장소명을 반환합니다."""
+    return _NAME_NOISE.sub("", unicodedata.normalize("NFKC", name or "")).lower()
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """전화번호에서 숫자만 남깁니다."""
+    return re.sub(r"\D", "", phone or "")
+
+
+def _distance_m(a: LocalPlace, b: LocalPlace) -> float:
+    """가까운 두 지점 사이의 거리(미터)를 equirectangular 근사로 계산합니다."""
+    x = math.radians(b.lon - a.lon) * math.cos(math.radians((a.lat + b.lat) / 2))
+    y = math.radians(b.lat - a.lat)
+    return math.hypot(x, y) * 6_371_000.0
+
+
+def _is_same_place(a: LocalPlace, b: LocalPlace) -> bool:
+    phone_a, phone_b = normalize_phone(a.phone), normalize_phone(b.phone)
+    if phone_a and phone_a == phone_b:
+        return True
+    name_a, name_b = normalize_name(a.name), normalize_name(b.name)
+    if not name_a or not name_b:
+        return False
+    if name_a in name_b or name_b in name_a:
+        return True
+    return SequenceMatcher(None, name_a, name_b).ratio() >= FUSION_NAME_SIMILARITY
+
+
+def _cell(place: LocalPlace, lat_deg: float, lon_deg: float) -> Tuple[int, int]:
+    return int(math.floor(place.lat / lat_deg)), int(math.floor(place.lon / lon_deg))
+
+
+def _find_match(
+    place: LocalPlace,
+    groups: List[List[LocalPlace]],
+    grid: Dict[Tuple[int, int], List[int]],
+    row: int,
+    col: int,
+    radius_m: float
+) -> Optional[int]:
+    """인접한 9개 격자에서 같은 장소로 볼 수 있는 그룹의 인덱스를 찾습니다."""
+    for d_row in (-1, 0, 1):
+        for d_col in (-1, 0, 1):
+            for index in grid.get((row + d_row, col + d_col), ()):
+                group = groups[index]
+                if place.source in {member.source for member in group}:
+                    continue
+                if _distance_m(group[0], place) <= radius_m and _is_same_place(group[0], place):
+                    return index
+    return None
+
+
+def _merge(group: List[LocalPlace]) -> FusedPlace:
+    fused = FusedPlace(name=None)
+    for place in group:
+        if place.source not in fused.sources:
+            fused.sources.append(place.source)
+        for name in _MERGED_FIELDS:
+            value = getattr(place, name)
+            if value in (None, ""):
+                continue
+            current = getattr(fused, name)
+            if current is None:
+                setattr(fused, name, value)
+            elif name in ("lat", "lon"):
+                continue
+            elif name == "phone" and normalize_phone(current) == normalize_phone(value):
+                continue
+            elif current != value:
+                fused.variants.setdefault(place.source, {})[name] = value
+    return fused
+
+
+def fuse_places(
+    places: List[LocalPlace],
+    radius_m: float = FUSION_RADIUS_M
+) -> List[FusedPlace]:
+    """
+    여러 provider의 장소 결과에서 같은 장소를 찾아 하나의 레코드로 병합합니다.
+    좌표를 격자(spatial hash)로 나눈 뒤 인접 격자 안에서만 이름/전화번호 유사도로 비교합니다.
+    좌표가 없는 결과는 병합하지 않고 그대로 반환합니다.
+
+    Args:
+        places (List[LocalPlace]): provider 순서대로 나열된 장소 목록
+        radius_m (float): 같은 장소로 볼 수 있는 최대 거리 (미터)
+
+    Returns:
+        List[FusedPlace]: 병합된 장소 목록 (처음 등장한 순서 유지)
+    """
+    # 격자 한 칸의 폭이 radius_m 이상이어야 인접 격자만 비교해도 누락이 없습니다.
+    located = [place for place in places if place.lat is not None and place.lon is not None]
+    max_lat = max((abs(place.lat) for place in located), default=0.0)
+    lat_deg = radius_m / _METERS_PER_DEGREE
+    lon_deg = lat_deg / max(math.cos(math.radians(max_lat)), 0.01)
+    grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    groups: List[List[LocalPlace]] = []
+
+    for place in places:
+        if place.lat is None or place.lon is None:
+            groups.append([place])
+            continue
+
+        row, col = _cell(place, lat_deg, lon_deg)
+        match = _find_match(place, groups, grid, row, col, radius_m)
+        if match is None:
+            groups.append([place])
+            grid[(row, col)].append(len(groups) - 1)
+        else:
+            groups[match].append(place)
+
+    return [_merge(group) for group in groups]
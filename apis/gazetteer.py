@@ -0,0 +1,267 @@
+import asyncio
+import bisect
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from apis.fusion import normalize_name
+
+
+# 장소명 사전 파일 (TSV: 이름, 위도, 경도[, 주소[, 만료 시각]]). 빈 값이면 사용하지 않습니다.
+GAZETTEER_PATH = os.environ.get(
+    "GAZETTEER_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "nl_map_search", "gazetteer.tsv"),
+)
+# 카카오 지오코딩 결과를 사전 파일에 이어 쓸지 여부
+GAZETTEER_LEARN = os.environ.get("GAZETTEER_LEARN", "true").lower() in ("1", "true", "yes")
+# 새로 배운 장소의 유지 시간 (초). 사전 파일에 처음부터 있던 장소는 만료되지 않습니다.
+GAZETTEER_LEARN_TTL = float(os.environ.get("GAZETTEER_LEARN_TTL", str(30 * 24 * 3600)))
+# 오타/띄어쓰기 차이를 허용하는 fuzzy 매칭의 최소 bigram 유사도 (Dice 계수)
+GAZETTEER_FUZZY_THRESHOLD = float(os.environ.get("GAZETTEER_FUZZY_THRESHOLD", "0.85"))
+
+
+# 사전 파일을 읽고 배운 장소를 이어 쓰는 작업자 (이벤트 루프를 막지 않고, 읽기/쓰기 순서를 유지하도록 1개)
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gazetteer")
+
+
+def _clean(value: str) -> str:
+    return value.replace("\t", " ").replace("\n", " ")
+
+
+def _digits(key: str) -> str:
+    return "".join(char for char in key if char.isdigit())
+
+
+def _bigrams(key: str) -> Set[str]:
+    if len(key) < 2:
+        return {key}
+    return {key[index:index + 2] for index in range(len(key) - 1)}
+
+
+class Gazetteer:
+    """
+    자주 쓰는 장소명(역, 행정구역, 랜드마크)의 좌표를 메모리에서 바로 찾는 오프라인 장소명 사전입니다.
+    정규화한 이름의 해시 맵으로 정확히 찾고, 정렬된 키 목록(prefix)과 문자 bigram 역색인(fuzzy)으로
+    비슷한 이름을 찾습니다. 파일은 load()로 작업자 스레드에서 읽으며(읽기 전의 조회는 miss),
+    새로 배운 장소는 만료 시각과 함께 파일 끝에 이어 씁니다.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = GAZETTEER_PATH,
+        learn: bool = GAZETTEER_LEARN,
+        learn_ttl: float = GAZETTEER_LEARN_TTL,
+    ):
+        self.path = path
+        self.learn_enabled = learn
+        self.learn_ttl = learn_ttl
+        self._entries: List[Dict[str, Any]] = []
+        self._expires_at: List[Optional[float]] = []
+        self._exact: Dict[str, int] = {}
+        self._sorted_keys: List[str] = []
+        self._bigram_index: Dict[str, Set[int]] = defaultdict(set)
+        self._keys: List[str] = []
+        self._loaded = False
+        self._loading: Optional[Future] = None
+        self._lock = threading.Lock()
+        self.counters = {"exact": 0, "fuzzy": 0, "misses": 0, "learned": 0}
+
+    async def load(self) -> None:
+        """
+        사전 파일을 작업자 스레드에서 한 번만 읽고 색인합니다.
+        동시에 여러 번 호출되면 같은 읽기 작업이 끝나기를 기다립니다.
+        """
+        if self._loaded:
+            return
+        if self._loading is None:
+            self._loading = _writer.submit(self._load)
+        await asyncio.wrap_future(self._loading)
+
+    def _load(self) -> None:
+        """사전 파일을 읽어 색인합니다 (_writer 작업자 스레드에서 실행)."""
+        with self._lock:
+            if self._loaded:
+                return
+            if self.path and os.path.exists(self.path):
+                now = time.time()
+                with open(self.path, encoding="utf-8") as file:
+                    for line in file:
+                        columns = line.rstrip("\n").split("\t")
+                        if len(columns) < 3 or line.startswith("#"):
+                            continue
+                        try:
+                            lat, lon = float(columns[1]), float(columns[2])
+                            # 다섯 번째 열은 배운 장소의 만료 시각 (없으면 만료되지 않음)
+                            expires_at = float(columns[4]) if len(columns) > 4 and columns[4] else None
+                        except ValueError:
+                            continue
+                        if expires_at is not None and expires_at <= now:
+                            continue
+                        self._add(
+                            columns[0], lat, lon, (columns[3] if len(columns) > 3 else None) or None,
+                            expires_at, keep_sorted=False,
+                        )
+            self._sorted_keys.sort()
+            self._loaded = True
+
+    def _add(
+        self,
+        name: str,
+        lat: float,
+        lon: float,
+        address: Optional[str] = None,
+        expires_at: Optional[float] = None,
+        keep_sorted: bool = True
+    ) -> bool:
+        """
+        색인에 장소를 추가합니다. 이미 같은 이름이 있으면 False (잠금은 호출자가 잡음).
+        같은 이름의 항목이 만료되었으면 그 자리를 새 장소로 바꿉니다.
+        """
+        key = normalize_name(name)
+        if not key:
+            return False
+        entry = {
+            "x": repr(lon),
+            "y": repr(lat),
+            "place_name": name,
+            "address_name": address,
+        }
+        index = self._exact.get(key)
+        if index is not None:
+            if not self._expired(index):
+                return False
+            self._entries[index] = entry
+            self._expires_at[index] = expires_at
+            return True
+        index = len(self._entries)
+        self._entries.append(entry)
+        self._expires_at.append(expires_at)
+        self._keys.append(key)
+        self._exact[key] = index
+        if keep_sorted:
+            bisect.insort(self._sorted_keys, key)
+        else:
+            self._sorted_keys.append(key)
+        for gram in _bigrams(key):
+            self._bigram_index[gram].add(index)
+        return True
+
+    def _expired(self, index: int) -> bool:
+        expires_at = self._expires_at[index]
+        return expires_at is not None and expires_at <= time.time()
+
+    def lookup(self, query: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        장소명의 좌표를 사전에서 찾습니다.
+
+        Args:
+            query (str): 장소명
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], float]]: (x, y, place_name, address_name 딕셔너리, 신뢰도 0~1).
+                정확히 일치하면 1.0, fuzzy 매칭은 bigram 유사도. 찾지 못하면 None.
+        """
+        key = normalize_name(query)
+        if not self._loaded or not key:
+            return None
+        index = self._exact.get(key)
+        if index is not None and not self._expired(index):
+            self.counters["exact"] += 1
+            return dict(self._entries[index]), 1.0
+
+        # 숫자가 다른 이름(2호선/12호선, 3번 출구/4번 출구)은 다른 장소이므로 fuzzy 매칭에서 제외
+        matches = [
+            match for match in self.search(query, limit=3)
+            if _digits(normalize_name(match[0]["place_name"])) == _digits(key)
+        ]
+        if matches and matches[0][1] >= GAZETTEER_FUZZY_THRESHOLD:
+            self.counters["fuzzy"] += 1
+            return matches[0]
+        self.counters["misses"] += 1
+        return None
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        이름이 query로 시작하거나 비슷한 장소를 유사도 순으로 반환합니다 (자동 완성, fuzzy 매칭용).
+
+        Args:
+            query (str): 장소명 또는 앞부분
+            limit (int): 최대 결과 수
+
+        Returns:
+            List[Tuple[Dict[str, Any], float]]: (장소 딕셔너리, 유사도) 목록
+        """
+        key = normalize_name(query)
+        if not self._loaded or not key:
+            return []
+
+        scores: Dict[int, float] = {}
+        # prefix: 정렬된 키에서 query로 시작하는 구간을 이진 탐색 (점수는 이름에서 query가 차지하는 비율)
+        start = bisect.bisect_left(self._sorted_keys, key)
+        for candidate in self._sorted_keys[start:start + limit * 4]:
+            if not candidate.startswith(key):
+                break
+            scores[self._exact[candidate]] = len(key) / len(candidate)
+
+        # fuzzy: bigram을 공유하는 후보만 세어 Dice 계수를 계산
+        grams = _bigrams(key)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for index in self._bigram_index.get(gram, ()):
+                shared[index] += 1
+        for index, count in shared.items():
+            dice = 2 * count / (len(grams) + len(_bigrams(self._keys[index])))
+            scores[index] = max(scores.get(index, 0.0), dice)
+
+        ranked = sorted(
+            ((index, score) for index, score in scores.items() if not self._expired(index)),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:limit]
+        return [(dict(self._entries[index]), round(score, 3)) for index, score in ranked]
+
+    def learn(self, name: str, document: Dict[str, Any]) -> None:
+        """
+        카카오 지오코딩 결과를 learn_ttl 동안 사전에 추가하고, 작업자 스레드에서 파일 끝에 이어 씁니다.
+
+        Args:
+            name (str): 조회한 장소명
+            document (Dict[str, Any]): x, y, place_name, address_name 딕셔너리
+        """
+        if not self.learn_enabled or not self._loaded:
+            return
+        try:
+            lat, lon = float(document["y"]), float(document["x"])
+        except (KeyError, TypeError, ValueError):
+            return
+        address = document.get("address_name") or ""
+        expires_at = time.time() + self.learn_ttl
+        with self._lock:
+            added = [
+                label for label in dict.fromkeys((name, document.get("place_name")))
+                if label and self._add(label, lat, lon, address or None, expires_at)
+            ]
+        if not added:
+            return
+        self.counters["learned"] += len(added)
+        if self.path:
+            lines = [f"{_clean(label)}\t{lat}\t{lon}\t{_clean(address)}\t{expires_at:.0f}\n" for label in added]
+            _writer.submit(self._append, lines)
+
+    def _append(self, lines: List[str]) -> None:
+        """배운 장소를 사전 파일 끝에 이어 씁니다 (_writer 작업자 스레드에서 실행)."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.writelines(lines)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self.counters,
+            "entries": sum(1 for index in range(len(self._entries)) if not self._expired(index)),
+        }
+
+
+gazetteer = Gazetteer()
@@ -0,0 +1,183 @@
+import asyncio
+import atexit
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+
+GEOCODE_CACHE_PATH = os.environ.get(
+    "GEOCODE_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "nl_map_search", "geocode.sqlite3"),
+)
+GEOCODE_CACHE_MAX_ENTRIES = int(os.environ.get("GEOCODE_CACHE_MAX_ENTRIES", "4096"))
+GEOCODE_CACHE_TTL = float(os.environ.get("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))
+GEOCODE_CACHE_NEGATIVE_TTL = float(os.environ.get("GEOCODE_CACHE_NEGATIVE_TTL", str(24 * 3600)))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키로 사용할 수 있도록 장소명을 정규화합니다.
+    유니코드 NFKC 정규화, 소문자 변환, 공백 정리를 수행합니다.
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query)).strip().lower()
+
+
+class GeocodeCache:
+    """
+    메모리 LRU와 SQLite 디스크 저장소로 구성된 2단계 지오코딩 캐시입니다.
+    좌표를 찾지 못한 장소명도 negative TTL 동안 캐시합니다.
+    디스크 읽기와 쓰기는 이벤트 루프를 막지 않도록 작업자 스레드 하나에서 실행하며,
+    저장할 항목은 모아 두었다가 한 번의 commit으로 씁니다.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = GEOCODE_CACHE_PATH,
+        max_entries: int = GEOCODE_CACHE_MAX_ENTRIES,
+        ttl: float = GEOCODE_CACHE_TTL,
+        negative_ttl: float = GEOCODE_CACHE_NEGATIVE_TTL,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._memory: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._pending: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self._flush_scheduled = False
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        # SQLite 연결은 이 작업자 스레드에서만 사용합니다.
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="geocache")
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """디스크 저장소를 처음 사용할 때 연결합니다. path가 비어 있으면 메모리만 사용합니다."""
+        if self._db is None and self.path:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _remember(self, key: str, expires_at: float, value: Optional[Dict[str, Any]]) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read(self, key: str) -> Optional[Tuple[str, float]]:
+        """디스크에서 항목을 읽습니다 (작업자 스레드에서 실행)."""
+        db = self._connect()
+        if db is None:
+            return None
+        return db.execute(
+            "SELECT value, expires_at FROM geocode WHERE key = ?", (key,)
+        ).fetchone()
+
+    async def lookup(self, query: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        캐시에서 장소명을 조회합니다. 메모리에 없을 때만 작업자 스레드에서 디스크를 읽습니다.
+
+        Args:
+            query (str): 장소명
+
+        Returns:
+            Tuple[bool, Optional[Dict]]: (캐시 적중 여부, 좌표 정보 또는 negative 캐시일 경우 None)
+        """
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key) or self._pending.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._remember(key, *entry)
+                    return True, entry[1]
+                self._memory.pop(key, None)
+
+        if not self.path:
+            return False, None
+        row = await asyncio.get_running_loop().run_in_executor(self._worker, self._read, key)
+        if row is None or row[1] <= now:
+            return False, None
+        value = json.loads(row[0])
+        with self._lock:
+            # 디스크를 읽는 동안 새로 저장된 결과가 있으면 덮어쓰지 않습니다.
+            if key not in self._memory:
+                self._remember(key, row[1], value)
+        return True, value
+
+    def store(self, query: str, value: Optional[Dict[str, Any]]) -> None:
+        """
+        지오코딩 결과를 캐시에 저장합니다. value가 None이면 negative 캐시로 저장합니다.
+        메모리에는 바로 저장하고, 디스크에는 작업자 스레드에서 모아서 씁니다.
+
+        Args:
+            query (str): 장소명
+            value (Dict, optional): 좌표 정보
+        """
+        key = normalize_query(query)
+        expires_at = time.time() + (self.ttl if value is not None else self.negative_ttl)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if not self.path:
+                return
+            self._pending[key] = (expires_at, value)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._worker.submit(self._flush)
+
+    def _flush(self) -> None:
+        """모아 둔 항목을 한 번의 commit으로 디스크에 씁니다 (작업자 스레드에서 실행)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flush_scheduled = False
+        db = self._connect()
+        if db is None or not pending:
+            return
+        db.executemany(
+            "INSERT OR REPLACE INTO geocode (key, value, expires_at) VALUES (?, ?, ?)",
+            [
+                (key, json.dumps(value, ensure_ascii=False), expires_at)
+                for key, (expires_at, value) in pending.items()
+            ],
+        )
+        db.commit()
+
+    def flush(self) -> None:
+        """아직 디스크에 쓰지 않은 항목을 저장하고 끝날 때까지 기다립니다."""
+        try:
+            self._worker.submit(self._flush).result()
+        except RuntimeError:
+            # 인터프리터 종료 중(atexit)에는 작업자가 이미 멈췄으므로 현재 스레드에서 씁니다.
+            self._flush()
+
+    def _clear_disk(self) -> None:
+        db = self._connect()
+        if db is not None:
+            db.execute("DELETE FROM geocode")
+            db.commit()
+
+    def clear(self) -> None:
+        """메모리와 디스크의 모든 캐시 항목을 삭제합니다."""
+        with self._lock:
+            self._memory.clear()
+            self._pending.clear()
+        if self.path:
+            self._worker.submit(self._clear_disk).result()
+
+
+geocode_cache = GeocodeCache()
+atexit.register(geocode_cache.flush)
@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from apis import coalesce, gazetteer, geocache, kakao, metrics, ratelimit
+from apis.fusion import normalize_name
+
+
+# 순서대로 시도할 지오코딩 백엔드 (쉼표로 구분)
+GEOCODER_BACKENDS = [
+    name.strip()
+    for name in os.environ.get("GEOCODER_BACKENDS", "kakao_address,kakao_keyword,nominatim").split(",")
+    if name.strip()
+]
+# 동시에 진행할 지오코딩 요청 수 (초당 요청 수는 apis.ratelimit에서 제한)
+GEOCODE_CONCURRENCY = int(os.environ.get("GEOCODE_CONCURRENCY", "8"))
+# 블로킹 백엔드(geopy Nominatim)를 실행할 작업자 수
+GEOCODER_BLOCKING_WORKERS = int(os.environ.get("GEOCODER_BLOCKING_WORKERS", "1"))
+# 환경변수로 사용자 에이전트 설정 권장 (Nominatim 이용 정책)
+NOMINATIM_USER_AGENT = os.environ.get("NOMINATIM_USER_AGENT", "mcp-geocoder-example")
+
+_NOT_FOUND = "좌표를 찾을 수 없습니다."
+
+# 카카오 백엔드에서 이름이 정확히 일치한(신뢰도 0.95 이상) 결과만 장소명 사전(apis.gazetteer)에 추가.
+# 부분 일치("스타벅스" -> "스타벅스 강남R점")를 배우면 모호한 장소명이 한 지점으로 고정됩니다.
+_LEARN_MIN_CONFIDENCE = 0.95
+_LEARN_BACKENDS = {"kakao_address", "kakao_keyword"}
+
+# 주소처럼 보이는 토큰: 시/도 약칭, 번지/건물 번호, 행정구역/도로명 접미사
+_ADDRESS_TOKEN = re.compile(
+    r"^(서울|부산|대구|인천|광주|대전|울산|세종|경기|강원|충북|충남|전북|전남|경북|경남|제주"
+    r"|\d+(-\d+)?(번지|호)?|지하|산\d*|[가-힣\d]+(특별시|광역시|특별자치시|특별자치도|도|시|군|구|읍|면|동|가|리|로|길))$"
+)
+
+# 백엔드: 장소명 -> (x, y, place_name, address_name 딕셔너리, 신뢰도 0~1) 또는 None
+Backend = Callable[[str], Awaitable[Optional[Tuple[Dict[str, Any], float]]]]
+
+_blocking_executor = ThreadPoolExecutor(max_workers=GEOCODER_BLOCKING_WORKERS, thread_name_prefix="geocoder")
+_geolocator = None
+
+
+def looks_like_address(query: str) -> bool:
+    """모든 토큰이 주소 형식(행정구역, 도로명, 번지)이면 True"""
+    tokens = query.split()
+    return bool(tokens) and all(_ADDRESS_TOKEN.match(token) for token in tokens)
+
+
+async def _kakao_address(query: str) -> Optional[Tuple[Dict[str, Any], float]]:
+    """카카오 주소 검색. 주소처럼 보이는 검색어만 요청합니다 (상호명은 키워드 검색이 담당)."""
+    if not looks_like_address(query):
+        return None
+    documents = json.loads(await kakao.search_address_kakao(query))["documents"]
+    if not documents:
+        return None
+    first = documents[0]
+    # REGION_ADDR/ROAD_ADDR는 번지까지 일치, REGION/ROAD는 행정구역이나 도로 전체
+    confidence = 0.95 if first.get("address_type", "").endswith("_ADDR") else 0.75
+    return {
+        "x": first["x"],
+        "y": first["y"],
+        "place_name": first.get("address_name"),
+        "address_name": first.get("address_name"),
+    }, confidence
+
+
+async def _kakao_keyword(query: str) -> Optional[Tuple[Dict[str, Any], float]]:
+    """카카오 키워드 검색의 첫 번째 장소. 장소명이 검색어와 일치할수록 신뢰도가 높습니다."""
+    documents = json.loads(await kakao.search_local_kakao(query))["documents"]
+    if not documents:
+        return None
+    first = documents[0]
+    key, name = normalize_name(query), normalize_name(first.get("place_name") or "")
+    if key == name:
+        confidence = 0.95
+    elif key and (key in name or name in key):
+        confidence = 0.85
+    else:
+        confidence = 0.7
+    return {
+        "x": first["x"],
+        "y": first["y"],
+        "place_name": first.get("place_name"),
+        "address_name": first.get("address_name"),
+    }, confidence
+
+
+def _get_geolocator():
+    """Create the Nominatim geolocator on first use."""
+    global _geolocator
+    if _geolocator is None:
+        from geopy.geocoders import Nominatim
+        _geolocator = Nominatim(user_agent=NOMINATIM_USER_AGENT, timeout=10)
+    return _geolocator
+
+
+def _nominatim_search(query: str):
+    """블로킹 geopy 호출 - _blocking_executor에서 실행됩니다."""
+    return _get_geolocator().geocode(query, language="ko")
+
+
+async def _nominatim(query: str) -> Optional[Tuple[Dict[str, Any], float]]:
+    """OpenStreetMap Nominatim. 초당 1건 제한을 지키고 블로킹 호출은 작업자 스레드에서 실행합니다."""
+    await ratelimit.acquire("nominatim")
+    started = time.perf_counter()
+    status = "200"
+    try:
+        location = await asyncio.get_running_loop().run_in_executor(_blocking_executor, _nominatim_search, query)
+    except Exception:
+        status = "transport_error"
+        raise
+    finally:
+        metrics.record_upstream("nominatim", "search", status, time.perf_counter() - started)
+    if location is None:
+        return None
+    # importance(0~1)는 OSM 객체의 인지도로, 작은 가게일수록 낮음
+    importance = float(location.raw.get("importance") or 0.0)
+    return {
+        "x": repr(location.longitude),
+        "y": repr(location.latitude),
+        "place_name": query,
+        "address_name": location.address,
+    }, round(min(0.8, 0.4 + 0.4 * importance), 3)
+
+
+BACKENDS: Dict[str, Backend] = {
+    "kakao_address": _kakao_address,
+    "kakao_keyword": _kakao_keyword,
+    "nominatim": _nominatim,
+}
+# 느리거나 엄격한 요청 한도가 있어 일괄 지오코딩에서 마지막에 따로 처리하는 백엔드
+BLOCKING_BACKENDS: Set[str] = {"nominatim"}
+
+
+def register_backend(name: str, backend: Backend, blocking: bool = False) -> None:
+    """
+    지오코딩 백엔드를 등록합니다. 사용하려면 GEOCODER_BACKENDS에도 이름을 추가해야 합니다.
+
+    Args:
+        name (str): 백엔드 이름
+        backend (Backend): 장소명을 받아 (좌표 딕셔너리, 신뢰도) 또는 None을 반환하는 코루틴 함수
+        blocking (bool): 일괄 지오코딩에서 다른 백엔드가 모두 끝난 뒤 시도할지 여부
+    """
+    BACKENDS[name] = backend
+    if blocking:
+        BLOCKING_BACKENDS.add(name)
+    else:
+        BLOCKING_BACKENDS.discard(name)
+
+
+@coalesce.coalesced("geocoder", "geocode")
+async def geocode(
+    query: str,
+    backends: Optional[Sequence[str]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    장소명을 좌표로 변환합니다.
+    지오코딩 캐시, 오프라인 장소명 사전을 먼저 확인한 뒤 백엔드를 순서대로 시도하고 처음 찾은 결과를 사용합니다.
+    결과는 지오코딩 캐시에 저장되며, 모든 백엔드가 찾지 못한 장소명은 negative 캐시로 저장됩니다.
+
+    Args:
+        query (str): 좌표를 구할 장소명 또는 주소
+        backends (Sequence[str], optional): 시도할 백엔드 이름 (기본값: GEOCODER_BACKENDS)
+
+    Returns:
+        Optional[Dict[str, Any]]: x, y, place_name, address_name, confidence(0~1), source(백엔드 이름) 딕셔너리
+            (찾지 못한 경우 None)
+
+    Raises:
+        Exception: 시도한 모든 백엔드가 오류로 실패한 경우 첫 번째 오류
+    """
+    hit, document = await geocache.geocode_cache.lookup(query)
+    if hit:
+        return document
+
+    await gazetteer.gazetteer.load()
+    match = gazetteer.gazetteer.lookup(query)
+    if match is not None:
+        return {**match[0], "confidence": match[1], "source": "gazetteer"}
+
+    names = [name for name in (GEOCODER_BACKENDS if backends is None else backends) if name in BACKENDS]
+    errors = []
+    for name in names:
+        try:
+            match = await BACKENDS[name](query)
+        except Exception as e:
+            errors.append(e)
+            continue
+        if match is not None:
+            document = {**match[0], "confidence": match[1], "source": name}
+            geocache.geocode_cache.store(query, document)
+            if name in _LEARN_BACKENDS and match[1] >= _LEARN_MIN_CONFIDENCE:
+                gazetteer.gazetteer.learn(query, document)
+            return document
+
+    if errors and len(errors) == len(names):
+        raise errors[0]
+    # 일부 백엔드만 시도했거나 오류가 섞여 있으면 다음 호출에서 다시 시도하도록 negative 캐시에 남기지 않음
+    if backends is None and not errors:
+        geocache.geocode_cache.store(query, None)
+    return None
+
+
+def _place(query: str, document: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if document is None:
+        return {"name": query, "error": _NOT_FOUND}
+    return {
+        "name": query,
+        "lat": float(document["y"]),
+        "lon": float(document["x"]),
+        "place_name": document.get("place_name"),
+        "address_name": document.get("address_name"),
+        "confidence": document.get("confidence"),
+        "source": document.get("source"),
+    }
+
+
+async def geocode_many(
+    queries: List[str],
+    concurrency: int = GEOCODE_CONCURRENCY
+) -> List[Dict[str, Any]]:
+    """
+    여러 장소명을 한 번에 지오코딩합니다. 중복된 장소명은 한 번만 요청합니다.
+    빠른 백엔드(카카오)로 모든 장소를 concurrency개씩 동시에 처리한 뒤, 찾지 못한 장소만 블로킹 백엔드(Nominatim)로
+    넘기므로 초당 1건 제한이 있는 백엔드가 나머지 장소의 처리를 막지 않습니다.
+
+    Args:
+        queries (List[str]): 장소명 목록
+        concurrency (int): 동시에 진행할 지오코딩 요청 수
+
+    Returns:
+        List[Dict[str, Any]]: queries와 같은 순서의 결과 목록.
+            성공: name, lat, lon, place_name, address_name, confidence, source / 실패: name, error
+    """
+    unique = list(dict.fromkeys(queries))
+    fast = [name for name in GEOCODER_BACKENDS if name not in BLOCKING_BACKENDS]
+    slow = [name for name in GEOCODER_BACKENDS if name in BLOCKING_BACKENDS]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(query: str, backends: List[str], limited: bool) -> Dict[str, Any]:
+        try:
+            if not limited:
+                return _place(query, await geocode(query, backends))
+            async with semaphore:
+                return _place(query, await geocode(query, backends))
+        except Exception as e:
+            return {"name": query, "error": f"{type(e).__name__}: {e}"}
+
+    results = dict(zip(unique, await asyncio.gather(*(resolve(query, fast, True) for query in unique))))
+
+    # 빠른 백엔드가 찾지 못한 장소만 블로킹 백엔드로 넘김 (오류로 실패한 장소는 제외).
+    # 블로킹 백엔드는 자체 rate limit과 작업자 수로 제한되므로 semaphore 없이 대기열에 넣음
+    missing = [query for query in unique if results[query].get("error") == _NOT_FOUND]
+    if slow and missing:
+        for query, place in zip(missing, await asyncio.gather(*(resolve(query, slow, False) for query in missing))):
+            results[query] = place
+    for query in missing:
+        if results[query].get("error") == _NOT_FOUND:
+            geocache.geocode_cache.store(query, None)
+
+    return [dict(results[query]) for query in queries]
@@ -0,0 +1,185 @@
+import numpy as np
+
+
+EARTH_RADIUS_M = 6_371_000.0
+
+# project_onto_polyline이 한 번에 만드는 지점-구간 행렬의 최대 크기 (약 100만 쌍 = 행렬당 8MB)
+PROJECTION_MAX_CELLS = 1_000_000
+
+
+def to_local_meters(lonlat: np.ndarray) -> np.ndarray:
+    """
+    경위도 배열(N x 2, [lon, lat])을 평균 위도 기준 equirectangular 평면 좌표(미터)로 변환합니다.
+    수십 km 이내의 경로 단순화나 거리 비교에 충분한 정확도를 가집니다.
+    """
+    radians = np.radians(lonlat)
+    cos_lat = np.cos(radians[:, 1].mean())
+    return np.column_stack((radians[:, 0] * cos_lat, radians[:, 1])) * EARTH_RADIUS_M
+
+
+def _segment_distances(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """points의 각 점에서 선분 start-end까지의 거리를 한 번에 계산합니다."""
+    segment = end - start
+    length_sq = float(segment @ segment)
+    if length_sq == 0.0:
+        return np.hypot(*(points - start).T)
+    t = np.clip(((points - start) @ segment) / length_sq, 0.0, 1.0)
+    projection = start + t[:, None] * segment
+    return np.hypot(*(points - projection).T)
+
+
+def simplify_polyline(lonlat: np.ndarray, tolerance_m: float) -> np.ndarray:
+    """
+    Douglas-Peucker 알고리즘으로 경로(N x 2, [lon, lat])를 단순화합니다.
+    구간별 거리 계산은 NumPy 배열 연산으로 수행합니다.
+
+    Args:
+        lonlat (np.ndarray): 경위도 배열
+        tolerance_m (float): 허용 오차 (미터). 0 이하이면 단순화하지 않습니다.
+
+    Returns:
+        np.ndarray: 단순화된 경위도 배열 (시작점과 끝점은 항상 유지)
+    """
+    count = len(lonlat)
+    if count < 3 or tolerance_m <= 0:
+        return lonlat
+
+    points = to_local_meters(lonlat)
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = _segment_distances(points[first + 1:last], points[first], points[last])
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance_m:
+            split = first + 1 + index
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return lonlat[keep]
+
+
+def cumulative_lengths(lonlat: np.ndarray) -> np.ndarray:
+    """경로 시작점부터 각 좌표까지의 누적 거리(미터)를 반환합니다."""
+    points = to_local_meters(lonlat)
+    steps = np.hypot(*np.diff(points, axis=0).T)
+    return np.concatenate(([0.0], np.cumsum(steps)))
+
+
+def sample_polyline(lonlat: np.ndarray, interval_m: float) -> np.ndarray:
+    """
+    경로를 따라 interval_m 간격으로 좌표를 샘플링합니다 (끝점 포함).
+
+    Args:
+        lonlat (np.ndarray): 경위도 배열 (N x 2)
+        interval_m (float): 샘플 간격 (미터)
+
+    Returns:
+        np.ndarray: 샘플 좌표 배열 (M x 2, [lon, lat])
+    """
+    lengths = cumulative_lengths(lonlat)
+    total = lengths[-1]
+    if total == 0.0:
+        return lonlat[:1]
+    targets = np.append(np.arange(0.0, total, interval_m), total)
+    return np.column_stack((
+        np.interp(targets, lengths, lonlat[:, 0]),
+        np.interp(targets, lengths, lonlat[:, 1]),
+    ))
+
+
+def project_onto_polyline(points: np.ndarray, lonlat: np.ndarray, max_cells: int = PROJECTION_MAX_CELLS):
+    """
+    여러 지점을 경로에 한 번에 투영하여 경로까지의 거리와 경로상 위치를 계산합니다.
+    지점-구간 행렬이 max_cells를 넘지 않도록 경로 구간을 나눠 계산하므로
+    단순화하지 않은 긴 경로에서도 메모리 사용량이 일정합니다.
+
+    Args:
+        points (np.ndarray): 지점 경위도 배열 (P x 2)
+        lonlat (np.ndarray): 경로 경위도 배열 (N x 2, N >= 2)
+        max_cells (int): 한 번에 계산할 최대 지점-구간 쌍 수
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (경로까지의 최단 거리, 출발점부터 투영 지점까지의 경로 거리) (미터)
+    """
+    radians = np.radians(lonlat)
+    cos_lat = np.cos(radians[:, 1].mean())
+
+    def project(values: np.ndarray) -> np.ndarray:
+        values = np.radians(values)
+        return np.column_stack((values[:, 0] * cos_lat, values[:, 1])) * EARTH_RADIUS_M
+
+    line = project(lonlat)
+    targets = project(points)
+    starts, segments = line[:-1], np.diff(line, axis=0)
+    lengths_sq = np.einsum("ij,ij->i", segments, segments)
+    segment_lengths = np.sqrt(lengths_sq)
+    offsets_along = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+    lengths_sq[lengths_sq == 0.0] = np.inf
+
+    best_distances = np.full(len(points), np.inf)
+    best_along = np.zeros(len(points))
+    chunk = max(1, max_cells // max(len(points), 1))
+    for first in range(0, len(segments), chunk):
+        part = slice(first, first + chunk)
+        # (P x chunk) 행렬로 지점-구간 쌍의 투영 비율과 거리를 계산합니다.
+        offsets = targets[:, None, :] - starts[None, part, :]
+        t = np.clip(np.einsum("psk,sk->ps", offsets, segments[part]) / lengths_sq[part], 0.0, 1.0)
+        nearest = starts[None, part, :] + t[..., None] * segments[None, part, :]
+        distances = np.hypot(*(targets[:, None, :] - nearest).transpose(2, 0, 1))
+
+        best = np.argmin(distances, axis=1)
+        rows = np.arange(len(points))
+        closer = distances[rows, best] < best_distances
+        segment = first + best[closer]
+        best_distances[closer] = distances[rows, best][closer]
+        best_along[closer] = offsets_along[segment] + t[rows, best][closer] * segment_lengths[segment]
+    return best_distances, best_along
+
+
+def haversine_m(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """기준점에서 여러 지점까지의 대원 거리(미터)를 한 번에 계산합니다."""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def radius_bbox(lat: float, lon: float, radius_m: float):
+    """중심점과 반경을 감싸는 경위도 bounding box (south, west, north, east)를 반환합니다."""
+    d_lat = np.degrees(radius_m / EARTH_RADIUS_M)
+    d_lon = d_lat / max(np.cos(np.radians(lat)), 1e-6)
+    return lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon
+
+
+def bbox_mask(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    south: float,
+    west: float,
+    north: float,
+    east: float
+) -> np.ndarray:
+    """bounding box 안에 있는 지점의 마스크를 반환합니다."""
+    return (lats >= south) & (lats <= north) & (lons >= west) & (lons <= east)
+
+
+def polygon_mask(lats: np.ndarray, lons: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """
+    다각형(M x 2, [lat, lon]) 안에 있는 지점의 마스크를 even-odd ray casting으로 계산합니다.
+    꼭짓점마다 모든 지점을 배열 연산으로 한 번에 판정합니다.
+    """
+    inside = np.zeros(len(lats), dtype=bool)
+    previous = len(polygon) - 1
+    for current in range(len(polygon)):
+        lat_a, lon_a = polygon[current]
+        lat_b, lon_b = polygon[previous]
+        crosses = (lat_a > lats) != (lat_b > lats)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            intersect_lon = (lon_b - lon_a) * (lats - lat_a) / (lat_b - lat_a) + lon_a
+        inside ^= crosses & (lons < intersect_lon)
+        previous = current
+    return inside
@@ -1,7 +1,7 @@
 import os
 from typing import Any, Dict
 
-import httpx
+from apis import cache, coalesce, http
 
 
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
@@ -9,6 +9,8 @@ GOOGLE_SEARCH_ENGINE_ID = os.environ.get("GOOGLE_SEARCH_ENGINE_ID")
 GOOGLE_BASE_URL = "https://www.googleapis.com/customsearch/v1"
 
 
+@cache.cached("google", "customsearch")
+@coalesce.coalesced("google", "customsearch")
 async def search_web_google(
     query: str,
     display: int = 10,
@@ -36,7 +38,7 @@ async def search_web_google(
         "lr": "lang_ko",
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(GOOGLE_BASE_URL, params=params)
-        response.raise_for_status()
-        return response.text
\ No newline at end of file
+    response = await http.request(
+        "google", "GET", GOOGLE_BASE_URL, endpoint="customsearch", params=params
+    )
+    return response.text
\ No newline at end of file
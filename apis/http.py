@@ -0,0 +1,262 @@
+import asyncio
+import importlib.util
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from apis import breaker, metrics, quota
+
+
+# 커넥션 풀 설정 (환경변수로 조정 가능)
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.environ.get("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.environ.get("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.environ.get("HTTP_BACKOFF_MAX", "20"))
+
+# hedged request: GET 요청이 최근 p95 지연 시간을 넘기면 같은 요청을 한 번 더 보내고 먼저 온 응답을 사용
+HTTP_HEDGE_ENABLED = os.environ.get("HTTP_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+HTTP_HEDGE_MIN_SAMPLES = int(os.environ.get("HTTP_HEDGE_MIN_SAMPLES", "20"))
+HTTP_HEDGE_MIN_DELAY = float(os.environ.get("HTTP_HEDGE_MIN_DELAY", "0.05"))
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_lifespan_depth = 0
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    """
+    커넥션 풀과 keep-alive가 설정된 AsyncClient를 생성합니다.
+    HTTP/2는 HTTP2_ENABLED가 켜져 있고 h2 패키지가 설치된 경우에만 사용합니다.
+    """
+    http2 = HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(
+        http2=http2,
+        transport=_transport,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+    )
+
+
+def get_client(provider: str) -> httpx.AsyncClient:
+    """
+    provider별로 공유되는 AsyncClient를 반환합니다.
+    서버 lifespan 밖에서 호출되면 필요할 때 생성합니다.
+
+    Args:
+        provider (str): "naver", "kakao", "google", "youtube" 중 하나
+
+    Returns:
+        httpx.AsyncClient: 재사용 가능한 클라이언트
+    """
+    client = _clients.get(provider)
+    if client is None or client.is_closed:
+        client = _build_client()
+        _clients[provider] = client
+    return client
+
+
+def install_transport(transport: Optional[httpx.AsyncBaseTransport]) -> None:
+    """
+    이후 생성되는 모든 provider 클라이언트가 사용할 transport를 지정합니다.
+    벤치마크에서 httpx.MockTransport로 provider API를 대신할 때 사용하며, None이면 기본 transport로 돌아갑니다.
+    이미 열린 클라이언트에는 적용되지 않으므로 클라이언트가 만들어지기 전이나 aclose_clients() 이후에 호출합니다.
+    """
+    global _transport
+    _transport = transport
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 시간(초)으로 변환합니다."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _backoff(attempt: int) -> float:
+    """지수 백오프에 full jitter를 적용한 대기 시간(초)을 반환합니다."""
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+def _is_retryable(response: httpx.Response) -> bool:
+    return response.status_code == 429 or response.status_code >= 500
+
+
+def _hedge_delay(provider: str, method: str, endpoint: str) -> Optional[float]:
+    """
+    hedged request를 보낼 대기 시간(초)을 반환합니다. hedging 대상이 아니면 None.
+    멱등한 GET 요청 중 quota 비용이 1인 엔드포인트만 대상이며,
+    엔드포인트의 지연 시간 표본이 HTTP_HEDGE_MIN_SAMPLES개 이상 모인 뒤 p95를 기준으로 합니다.
+    """
+    if not HTTP_HEDGE_ENABLED or method.upper() != "GET":
+        return None
+    if quota.ENDPOINT_COSTS.get((provider, endpoint), 1) != 1:
+        return None
+    histogram = metrics.registry.histogram("upstream_request_duration_seconds", provider=provider, endpoint=endpoint)
+    if histogram is None or histogram.count < HTTP_HEDGE_MIN_SAMPLES:
+        return None
+    return max(HTTP_HEDGE_MIN_DELAY, histogram.quantile(0.95))
+
+
+async def _send(provider: str, method: str, url: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+    """
+    요청을 한 번 보냅니다. hedging 대상이면 첫 요청이 p95 안에 끝나지 않을 때 두 번째 요청을 보내고,
+    먼저 성공한 응답을 반환한 뒤 나머지 요청은 취소합니다.
+    두 번째 요청은 한도 안에서 바로 보낼 수 있을 때만 보내며, 그렇지 않으면 첫 요청의 결과를 그대로 사용합니다.
+    """
+    client = get_client(provider)
+    delay = _hedge_delay(provider, method, endpoint)
+    if delay is None:
+        return await client.request(method, url, **kwargs)
+
+    first = asyncio.ensure_future(client.request(method, url, **kwargs))
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+    except asyncio.CancelledError:
+        # 호출자가 취소되면(마감 시간 등) 첫 요청도 취소합니다.
+        first.cancel()
+        raise
+    if done:
+        return first.result()
+
+    # 회로가 닫혀 있지 않거나 한도 때문에 바로 보낼 수 없으면 hedge 없이 첫 요청을 기다립니다.
+    if (
+        breaker.get_breaker(provider).state != breaker.CLOSED
+        or not quota.quota_manager.try_reserve(provider, endpoint)
+    ):
+        return await first
+    second = asyncio.ensure_future(client.request(method, url, **kwargs))
+    pending = {first, second}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda task: task.exception() is not None):
+                if task.exception() is None or not pending:
+                    metrics.record_hedge(provider, endpoint, "hedge" if task is second else "primary")
+                    return task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def request(
+    provider: str,
+    method: str,
+    url: str,
+    endpoint: str = "",
+    **kwargs: Any
+) -> httpx.Response:
+    """
+    provider 클라이언트로 요청을 보냅니다.
+    요청마다 일일 한도와 초당 한도를 확인하고, 429/5xx 응답이나 연결 오류는
+    Retry-After를 따르거나 지터가 적용된 지수 백오프로 재시도합니다.
+    시도마다 지연 시간, 상태 코드, 주고받은 바이트 수를 apis.metrics에 기록합니다.
+    연결 오류와 5xx가 이어져 provider 회로가 열리면 요청을 보내지 않고 바로 실패하며,
+    HTTP_HEDGE_ENABLED이면 느린 GET 요청에 hedged request를 보냅니다.
+
+    Args:
+        provider (str): provider 이름
+        method (str): HTTP 메서드
+        url (str): 요청 URL
+        endpoint (str): 한도 계산에 사용할 엔드포인트 이름
+        **kwargs: httpx 요청 인자 (params, headers, json 등)
+
+    Returns:
+        httpx.Response: 성공한 응답
+
+    Raises:
+        quota.QuotaExceededError: 일일 한도를 초과한 경우
+        breaker.CircuitOpenError: provider 회로가 열려 있는 경우
+        httpx.HTTPStatusError: 재시도 후에도 실패한 경우
+    """
+    circuit = breaker.get_breaker(provider)
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        circuit.before_request()
+        await quota.quota_manager.reserve(provider, endpoint)
+        with metrics.span("upstream", provider=provider, endpoint=endpoint, attempt=attempt) as trace:
+            started = time.perf_counter()
+            try:
+                response = await _send(provider, method, url, endpoint, **kwargs)
+            except httpx.TransportError as error:
+                circuit.record_failure()
+                metrics.record_upstream(provider, endpoint, "transport_error", time.perf_counter() - started)
+                if trace is not None:
+                    trace.attributes["error"] = type(error).__name__
+                if attempt == HTTP_MAX_RETRIES:
+                    raise
+                metrics.record_retry(provider, endpoint)
+                await asyncio.sleep(_backoff(attempt))
+                continue
+
+            if response.status_code >= 500:
+                circuit.record_failure()
+            else:
+                circuit.record_success()
+            metrics.record_upstream(
+                provider,
+                endpoint,
+                str(response.status_code),
+                time.perf_counter() - started,
+                len(response.request.content),
+                len(response.content),
+            )
+            if trace is not None:
+                trace.attributes.update(status=response.status_code, bytes=len(response.content))
+
+        if _is_retryable(response) and attempt < HTTP_MAX_RETRIES:
+            metrics.record_retry(provider, endpoint)
+            delay = _retry_after(response)
+            await asyncio.sleep(min(HTTP_BACKOFF_MAX, delay) if delay is not None else _backoff(attempt))
+            continue
+
+        response.raise_for_status()
+        return response
+
+
+async def aclose_clients() -> None:
+    """열려 있는 모든 provider 클라이언트를 닫습니다."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+@asynccontextmanager
+async def lifespan(server: Any = None) -> AsyncIterator[Dict[str, httpx.AsyncClient]]:
+    """
+    FastMCP 서버 lifespan에서 provider 클라이언트를 닫고 남은 일일 사용량을 저장합니다.
+    클라이언트(SSL 컨텍스트 포함)는 세션 시작을 늦추지 않도록 처음 요청할 때 get_client()로 생성하며,
+    HTTP transport에서는 세션마다 lifespan이 실행되므로 마지막 세션이 끝날 때만 클라이언트를 닫습니다.
+    """
+    global _lifespan_depth
+    _lifespan_depth += 1
+    try:
+        yield _clients
+    finally:
+        _lifespan_depth -= 1
+        if _lifespan_depth == 0:
+            await aclose_clients()
+            await asyncio.get_running_loop().run_in_executor(None, quota.quota_manager.flush)
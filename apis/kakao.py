@@ -1,8 +1,9 @@
+import asyncio
 import json
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-import httpx
+from apis import cache, coalesce, http, schema
 
 
 KAKAO_REST_API_KEY = os.environ.get("KAKAO_REST_API_KEY")
@@ -13,9 +14,22 @@ KAKAO_API_HEADERS = {
 KAKAO_LOCAL_API_ENDPOINT = "https://dapi.kakao.com"
 KAKAO_NAVI_API_ENDPOINT = "https://apis-navi.kakaomobility.com"
 
+# 경로 좌표 단순화 기본 허용 오차 (미터)
+ROUTE_SIMPLIFY_TOLERANCE_M = float(os.environ.get("ROUTE_SIMPLIFY_TOLERANCE_M", "20"))
+# 경로 비교 모드에서 요청할 경로 우선 순위 옵션
+ROUTE_PRIORITIES = ("RECOMMEND", "TIME", "DISTANCE")
+# 경로 캐시 키에 사용할 좌표 소수점 자릿수 (4자리 ≈ 11m)
+ROUTE_CACHE_COORD_PRECISION = int(os.environ.get("ROUTE_CACHE_COORD_PRECISION", "4"))
 
+
+@cache.cached("kakao", "keyword")
+@coalesce.coalesced("kakao", "keyword")
 async def search_local_kakao(
-    query: str
+    query: str,
+    x: Optional[float] = None,
+    y: Optional[float] = None,
+    radius: Optional[int] = None,
+    page: int = 1
 ) -> str:
     """
     카카오 지역 서비스에 등록된 지역별 업체 및 상호 검색 결과를 반환합니다.
@@ -23,19 +37,95 @@ async def search_local_kakao(
 
     Args:
         query (str): 검색할 키워드나 문구
+        x (float, optional): 검색 중심 경도
+        y (float, optional): 검색 중심 위도
+        radius (int, optional): 검색 반경 (미터, 최대 20000, x/y와 함께 사용)
+        page (int): 결과 페이지 번호 (1~3, 페이지당 15개)
 
     Returns:
         str: 검색 결과 JSON 문자열
     """
     url = f"{KAKAO_LOCAL_API_ENDPOINT}/v2/local/search/keyword.json"
     params = {"query": query}
+    if page > 1:
+        params["page"] = page
+    if x is not None and y is not None:
+        params.update({"x": x, "y": y, "sort": "distance"})
+        if radius is not None:
+            params["radius"] = radius
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=KAKAO_API_HEADERS, params=params)
-        response.raise_for_status()
-        return response.text
+    response = await http.request(
+        "kakao", "GET", url, endpoint="keyword", headers=KAKAO_API_HEADERS, params=params
+    )
+    return response.text
+
+
+@cache.cached("kakao", "address")
+@coalesce.coalesced("kakao", "address")
+async def search_address_kakao(
+    query: str
+) -> str:
+    """
+    카카오 주소 검색 결과를 반환합니다.
+    도로명/지번 주소나 행정구역명(예: "서울 성동구 왕십리로 83")을 좌표로 변환할 때 사용합니다.
+
+    Args:
+        query (str): 검색할 주소
+
+    Returns:
+        str: 검색 결과 JSON 문자열
+    """
+    url = f"{KAKAO_LOCAL_API_ENDPOINT}/v2/local/search/address.json"
+    params = {"query": query}
+
+    response = await http.request(
+        "kakao", "GET", url, endpoint="address", headers=KAKAO_API_HEADERS, params=params
+    )
+    return response.text
+
+
+@cache.cached("kakao", "category")
+@coalesce.coalesced("kakao", "category")
+async def search_category_kakao(
+    category_group_code: str,
+    x: float,
+    y: float,
+    radius: int = 1000,
+    page: int = 1
+) -> str:
+    """
+    카카오 카테고리 장소 검색 결과를 반환합니다.
+    주어진 좌표 반경 안의 주유소(OL7), 음식점(FD6), 카페(CE7) 등을 거리순으로 검색합니다.
+
+    Args:
+        category_group_code (str): 카카오 카테고리 그룹 코드 (예: "OL7")
+        x (float): 검색 중심 경도
+        y (float): 검색 중심 위도
+        radius (int): 검색 반경 (미터, 최대 20000)
+        page (int): 결과 페이지 번호 (1~3, 페이지당 15개)
+
+    Returns:
+        str: 검색 결과 JSON 문자열
+    """
+    url = f"{KAKAO_LOCAL_API_ENDPOINT}/v2/local/search/category.json"
+    params = {
+        "category_group_code": category_group_code,
+        "x": x,
+        "y": y,
+        "radius": radius,
+        "sort": "distance",
+    }
+    if page > 1:
+        params["page"] = page
+
+    response = await http.request(
+        "kakao", "GET", url, endpoint="category", headers=KAKAO_API_HEADERS, params=params
+    )
+    return response.text
 
 
+@cache.cached("kakao", "web")
+@coalesce.coalesced("kakao", "web")
 async def search_web_kakao(
     query: str
 ) -> str:
@@ -52,10 +142,10 @@ async def search_web_kakao(
     url = f"{KAKAO_LOCAL_API_ENDPOINT}/v2/search/web"
     params = {"query": query}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=KAKAO_API_HEADERS, params=params)
-        response.raise_for_status()
-        return response.text
+    response = await http.request(
+        "kakao", "GET", url, endpoint="web", headers=KAKAO_API_HEADERS, params=params
+    )
+    return response.text
 
 
 async def get_coordinates(
@@ -70,8 +160,12 @@ async def get_coordinates(
     Returns:
         Dict[str, Any]: 장소명과 x, y 좌표가 포함된 딕셔너리
     """
-    response_text = await search_local_kakao(destination)
-    data = json.loads(response_text)["documents"][0]
+    # geocoder는 이 모듈의 검색 함수를 사용하므로 순환 import를 피하기 위해 호출 시점에 불러옵니다.
+    from apis import geocoder
+
+    data = await geocoder.geocode(destination)
+    if data is None:
+        raise ValueError(f"'{destination}'의 좌표를 찾을 수 없습니다.")
     return {
         "name": destination, 
         "x": data["x"], 
@@ -79,6 +173,7 @@ async def get_coordinates(
     }
 
 
+@coalesce.coalesced("kakao", "directions")
 async def find_route_kakao(
     origin: str,
     destination: str,
@@ -103,71 +198,246 @@ async def find_route_kakao(
     """
     if way_points is None:
         way_points = []
-        
+
+    origin_info, destination_info, way_points_info = await get_route_coordinates(
+        origin, destination, way_points
+    )
+    return await request_directions(origin_info, destination_info, way_points_info, priority)
+
+
+async def get_route_coordinates(
+    origin: str,
+    destination: str,
+    way_points: List[str]
+) -> Tuple[Dict[str, Any], Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    출발지, 목적지, 경유지를 모두 동시에 지오코딩합니다.
+
+    Args:
+        origin (str): 출발지의 이름
+        destination (str): 도착지의 이름
+        way_points (List[str]): 경유지의 이름 목록
+
+    Returns:
+        Tuple: (출발지, 목적지, 경유지 목록) 각각 이름과 x, y 좌표가 포함된 딕셔너리
+    """
+    origin_info, destination_info, *way_points_info = await asyncio.gather(
+        *(get_coordinates(name) for name in [origin, destination, *way_points])
+    )
+    return origin_info, destination_info, way_points_info
+
+
+def _route_point_key(point: Dict[str, Any]) -> Tuple[float, float]:
+    return (
+        round(float(point["x"]), ROUTE_CACHE_COORD_PRECISION),
+        round(float(point["y"]), ROUTE_CACHE_COORD_PRECISION),
+    )
+
+
+async def request_directions(
+    origin_info: Dict[str, Any],
+    destination_info: Dict[str, Any],
+    way_points_info: List[Dict[str, Any]],
+    priority: str = "RECOMMEND"
+) -> str:
+    """
+    좌표로 변환된 출발지, 목적지, 경유지로 카카오 네비 경로 정보를 요청합니다.
+    반올림한 좌표, 경유지 순서, priority가 같은 요청은 ROUTE_CACHE_TTL 동안 경로 캐시의 응답을 재사용합니다.
+
+    Args:
+        origin_info (Dict[str, Any]): 출발지 이름과 x, y 좌표
+        destination_info (Dict[str, Any]): 도착지 이름과 x, y 좌표
+        way_points_info (List[Dict[str, Any]]): 경유지 이름과 x, y 좌표 목록
+        priority (str): 경로 우선 순위 옵션
+
+    Returns:
+        str: 경로 정보 JSON 문자열
+    """
     url = f"{KAKAO_NAVI_API_ENDPOINT}/v1/waypoints/directions"
-    
-    origin_info = await get_coordinates(origin)
-    destination_info = await get_coordinates(destination)
-    way_points_info = []
-    for way_point in way_points:
-        coordinate = await get_coordinates(way_point)
-        way_points_info.append(coordinate)
-    
     data = {
         "origin": origin_info,
         "destination": destination_info,
         "waypoints": way_points_info,
         "priority": priority,
     }
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=KAKAO_API_HEADERS, json=data)
-        response.raise_for_status()
+
+    async def fetch() -> str:
+        response = await http.request(
+            "kakao", "POST", url, endpoint="directions", headers=KAKAO_API_HEADERS, json=data
+        )
         return response.text
 
+    if not cache.RESPONSE_CACHE_ENABLED:
+        return await fetch()
+    key = {
+        "origin": _route_point_key(origin_info),
+        "destination": _route_point_key(destination_info),
+        "waypoints": tuple(_route_point_key(point) for point in way_points_info),
+        "priority": priority,
+    }
+    return await cache.route_cache.get_or_fetch("kakao", "directions", key, fetch)
+
+
+def _refine_section(section: Dict[str, Any], tolerance_m: float) -> Dict[str, Any]:
+    """
+    경로 구간 하나를 정제합니다.
+    같은 이름의 연속된 도로는 거리/시간을 합쳐 하나로 묶고, 구간 전체 경로는 단순화합니다.
+    """
+    # NumPy는 서버 시작 시간을 줄이기 위해 경로를 처음 정제할 때 불러옵니다.
+    import numpy as np
+    from apis import geometry
+
+    roads = []
+    vertexes = []
+    for road in section.get("roads", []):
+        if not roads or roads[-1]["name"] != road["name"]:
+            roads.append({"name": road["name"], "distance": 0, "duration": 0})
+        roads[-1]["distance"] += road.get("distance", 0)
+        roads[-1]["duration"] += road.get("duration", 0)
+        vertexes.extend(road["vertexes"])
+
+    lonlat = np.asarray(vertexes, dtype=float).reshape(-1, 2)
+    simplified = geometry.simplify_polyline(lonlat, tolerance_m)
+    return {
+        "distance": section.get("distance"),
+        "duration": section.get("duration"),
+        "roads": roads,
+        "geometry": np.round(simplified, 6).tolist(),
+    }
+
+
+def refine_route(
+    response_text: str,
+    priority: str = "RECOMMEND",
+    tolerance_m: float = ROUTE_SIMPLIFY_TOLERANCE_M
+) -> Dict[str, Any]:
+    """
+    카카오 네비 응답에서 요약, 구간(경유지 구간 포함)별 거리/시간과
+    단순화된 경로 좌표만 추린 딕셔너리를 만듭니다.
+
+    Args:
+        response_text (str): find_route_kakao 응답 JSON 문자열
+        priority (str): 요청한 경로 우선 순위 옵션
+        tolerance_m (float): 경로 단순화 허용 오차 (미터, 0이면 단순화하지 않음)
+
+    Returns:
+        Dict[str, Any]: 정제된 경로 정보 (경로 탐색에 실패하면 error, result_code)
+    """
+    route = json.loads(response_text)["routes"][0]
+    if route.get("result_code", 0) != 0:
+        return {
+            "error": route.get("result_msg"),
+            "result_code": route.get("result_code"),
+        }
+
+    summary = route.get("summary", {})
+    return {
+        "summary": {
+            "distance": summary.get("distance"),
+            "duration": summary.get("duration"),
+            "fare": summary.get("fare"),
+            "priority": summary.get("priority", priority),
+        },
+        "sections": [
+            _refine_section(section, tolerance_m)
+            for section in route.get("sections", [])
+        ],
+    }
+
 
 async def get_refined_route_info(
     origin: str,
     destination: str,
     way_points: List[str] = None,
-    priority: str = "RECOMMEND"
+    priority: str = "RECOMMEND",
+    tolerance_m: float = ROUTE_SIMPLIFY_TOLERANCE_M
 ) -> str:
     """
-    경로 정보를 가져와서 도로 구간 정보를 정제하여 반환합니다.
+    경로 정보를 가져와서 요약, 구간(경유지 구간 포함)별 거리/시간과
+    단순화된 경로 좌표를 compact JSON으로 반환합니다.
 
     Args:
         origin (str): 출발지의 이름
         destination (str): 도착지의 이름
         way_points (List[str], optional): 경유지의 이름 목록
         priority (str): 경로 우선 순위 옵션
+        tolerance_m (float): 경로 단순화 허용 오차 (미터, 0이면 단순화하지 않음)
 
     Returns:
-        str: 정제된 경로 정보 문자열
+        str: 정제된 경로 정보 JSON 문자열
     """
     response_text = await find_route_kakao(
         origin, destination, way_points, priority
     )
-    data = json.loads(response_text)
-    road_section = data["routes"][0]["sections"][0]["roads"]
+    return schema.dumps(refine_route(response_text, priority, tolerance_m))
 
-    refined_road_section = []
-    last_road_name = None
-    
-    for road in road_section:
-        if last_road_name != road["name"]:
-            last_road_name = road["name"]
-            refined_road_section.append({
-                "name": last_road_name,
-                "vertexes": [
-                    (road["vertexes"][0], road["vertexes"][1]), 
-                    None
-                ]
-            })
-        
-        refined_road_section[-1]["vertexes"][-1] = (
-            road["vertexes"][-2], 
-            road["vertexes"][-1]
-        )
-    
-    data["routes"][0]["sections"][0]["roads"] = refined_road_section
-    return str(data)
\ No newline at end of file
+
+def _compare_entry(route: Dict[str, Any]) -> Dict[str, Any]:
+    """정제된 경로에서 비교에 필요한 거리, 시간, 요금과 전체 경로 좌표만 남깁니다."""
+    if "error" in route:
+        return route
+    summary = route["summary"]
+    fare = summary.get("fare") or {}
+    return {
+        "distance": summary.get("distance"),
+        "duration": summary.get("duration"),
+        "toll": fare.get("toll"),
+        "taxi_fare": fare.get("taxi"),
+        "geometry": [
+            point
+            for section in route["sections"]
+            for point in section["geometry"]
+        ],
+    }
+
+
+async def compare_routes(
+    origin: str,
+    destination: str,
+    way_points: List[str] = None,
+    priorities: Sequence[str] = ROUTE_PRIORITIES,
+    tolerance_m: float = ROUTE_SIMPLIFY_TOLERANCE_M
+) -> Dict[str, Any]:
+    """
+    출발지, 목적지, 경유지를 한 번만 지오코딩한 뒤 여러 경로 우선 순위로
+    카카오 네비 경로를 동시에 요청하고, 거리/시간/통행료/택시 요금과 단순화된 경로 좌표를 나란히 반환합니다.
+
+    Args:
+        origin (str): 출발지의 이름
+        destination (str): 도착지의 이름
+        way_points (List[str], optional): 경유지의 이름 목록
+        priorities (Sequence[str]): 비교할 경로 우선 순위 옵션
+        tolerance_m (float): 경로 단순화 허용 오차 (미터, 0이면 단순화하지 않음)
+
+    Returns:
+        Dict[str, Any]: routes(우선 순위별 distance, duration, toll, taxi_fare, geometry 또는 error)
+
+    Raises:
+        Exception: 모든 우선 순위의 경로 요청이 실패한 경우 첫 번째 오류
+    """
+    if way_points is None:
+        way_points = []
+    priorities = list(dict.fromkeys(priority.upper() for priority in priorities))
+
+    origin_info, destination_info, way_points_info = await get_route_coordinates(
+        origin, destination, way_points
+    )
+    results = await asyncio.gather(
+        *(
+            request_directions(origin_info, destination_info, way_points_info, priority)
+            for priority in priorities
+        ),
+        return_exceptions=True,
+    )
+
+    failures = [result for result in results if isinstance(result, BaseException)]
+    if failures and len(failures) == len(results):
+        raise failures[0]
+
+    routes = {}
+    for priority, result in zip(priorities, results):
+        if isinstance(result, BaseException):
+            routes[priority] = {"error": f"{type(result).__name__}: {result}"}
+        else:
+            routes[priority] = _compare_entry(refine_route(result, priority, tolerance_m))
+    return {"routes": routes}
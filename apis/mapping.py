@@ -1,28 +1,177 @@
-from typing import Dict, Annotated, List, Optional
-import folium
-from folium.plugins import MarkerCluster
-from geopy.geocoders import Nominatim
-from geopy.distance import distance as geopy_distance
-import webbrowser
+from typing import TYPE_CHECKING, Dict, Annotated, List, Optional
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 import os
 
+from apis import geocoder
 
-from apis import kakao
-# 환경변수로 사용자 에이전트 설정 권장
-NOMINATIM_USER_AGENT = os.environ.get("NOMINATIM_USER_AGENT", "mcp-geocoder-example")
-_geolocator = Nominatim(user_agent=NOMINATIM_USER_AGENT, timeout=10)
+# folium, geopy, webbrowser, numpy는 import 비용이 커서 실제로 지도를 만들 때 불러옵니다.
+if TYPE_CHECKING:
+    import folium
 
-# 내부 쓰레드풀(geopy는 블로킹이므로 비동기 함수에서 run_in_executor로 사용)
-_thread_executor = ThreadPoolExecutor(max_workers=4)
+# 지도 생성/저장 작업자 수와 대기열 크기 (folium 렌더링과 파일 I/O는 블로킹이므로 run_in_executor로 실행)
+MAP_RENDER_WORKERS = int(os.environ.get("MAP_RENDER_WORKERS", "2"))
+MAP_RENDER_QUEUE_SIZE = int(os.environ.get("MAP_RENDER_QUEUE_SIZE", "16"))
+
+# 내부 쓰레드풀 (동시에 MAP_RENDER_WORKERS개의 지도만 렌더링하고 나머지는 executor 대기열에서 기다림)
+_thread_executor = ThreadPoolExecutor(max_workers=MAP_RENDER_WORKERS, thread_name_prefix="map-render")
+_pending_renders = 0
+
+# 장소 수가 이 값을 넘으면 마커를 브라우저에서 생성하는 대용량 렌더링 모드로 전환
+FAST_RENDER_THRESHOLD = int(os.environ.get("MAP_FAST_RENDER_THRESHOLD", "500"))
+
+# exact_distance 모드에서 bbox 사전 필터를 넓히는 비율 (구면과 타원체의 남북 거리 차이 보정)
+EXACT_BBOX_PADDING = 1.01
+
+# FastMarkerCluster가 데이터 행([lat, lon, popup_html])마다 호출하는 JS 콜백
+_FAST_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindPopup(row[2], {maxWidth: 300});
+    return marker;
+};
+"""
 
 def _within_radius(center: Dict[str,float], point: Dict[str,float], radius_m: float) -> bool:
     """center and point: {'lat':..., 'lon':...}"""
+    from geopy.distance import distance as geopy_distance
     return geopy_distance((center['lat'], center['lon']), (point['lat'], point['lon'])).meters <= radius_m
 
+def _filter_places(
+    places: List[Dict],
+    center: Optional[Dict[str, float]] = None,
+    radius_m: Optional[float] = None,
+    bbox: Optional[Dict[str, float]] = None,
+    polygon: Optional[List[List[float]]] = None,
+    exact_distance: bool = False,
+) -> List[Dict]:
+    """
+    Filter places by circle (center + radius_m), bbox and/or polygon in one array pass.
+    The circle check is a bounding-box prefilter followed by a vectorized haversine;
+    exact_distance=True re-checks the survivors with the geodesic distance instead.
+    bbox: {'south':.., 'west':.., 'north':.., 'east':..}, polygon: [[lat, lon], ...]
+    """
+    if not places:
+        return places
+
+    import numpy as np
+    from apis import geometry
+
+    lats = np.array([pl["lat"] for pl in places])
+    lons = np.array([pl["lon"] for pl in places])
+    mask = np.ones(len(places), dtype=bool)
+
+    if bbox:
+        mask &= geometry.bbox_mask(lats, lons, bbox["south"], bbox["west"], bbox["north"], bbox["east"])
+    if polygon and len(polygon) >= 3:
+        mask &= geometry.polygon_mask(lats, lons, np.asarray(polygon, dtype=float))
+    if center and radius_m:
+        # 구면 기준 bbox는 타원체의 남북 거리보다 최대 약 0.7% 좁으므로, geodesic으로 다시 확인할 때는 여유를 둡니다.
+        box_radius_m = radius_m * EXACT_BBOX_PADDING if exact_distance else radius_m
+        mask &= geometry.bbox_mask(lats, lons, *geometry.radius_bbox(center["lat"], center["lon"], box_radius_m))
+        candidates = np.flatnonzero(mask)
+        if exact_distance:
+            mask[candidates] = [_within_radius(center, places[i], radius_m) for i in candidates]
+        else:
+            mask[candidates] = geometry.haversine_m(
+                center["lat"], center["lon"], lats[candidates], lons[candidates]
+            ) <= radius_m
+
+    return [pl for pl, keep in zip(places, mask) if keep]
+
+def _popup_html(pl: Dict) -> str:
+    return f"<b>{pl['name']}</b><br/>{pl.get('popup','')}"
+
+def _add_markers(fmap: "folium.Map", places: List[Dict], cluster_markers: bool, render_mode: str) -> str:
+    """
+    Add place markers to the map and return the render mode actually used.
+    render_mode:
+      - "markers": one folium.Marker + folium.Popup per place
+      - "fast": marker data is embedded once and markers/popups are built in the browser
+                (FastMarkerCluster when clustering, otherwise a single GeoJSON layer)
+      - "auto": "fast" when len(places) > FAST_RENDER_THRESHOLD, else "markers"
+    """
+    import folium
+    from folium.plugins import FastMarkerCluster, MarkerCluster
+
+    if render_mode == "auto":
+        render_mode = "fast" if len(places) > FAST_RENDER_THRESHOLD else "markers"
+
+    if render_mode == "fast":
+        if cluster_markers:
+            data = [[pl["lat"], pl["lon"], _popup_html(pl)] for pl in places]
+            FastMarkerCluster(data, callback=_FAST_MARKER_CALLBACK).add_to(fmap)
+        else:
+            features = [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [pl["lon"], pl["lat"]]},
+                    "properties": {"name": pl["name"], "info": pl.get("popup", "")},
+                }
+                for pl in places
+            ]
+            folium.GeoJson(
+                {"type": "FeatureCollection", "features": features},
+                popup=folium.GeoJsonPopup(fields=["name", "info"], labels=False, max_width=300),
+            ).add_to(fmap)
+        return render_mode
+
+    marker_cluster = MarkerCluster().add_to(fmap) if cluster_markers else None
+    for pl in places:
+        marker = folium.Marker(location=(pl["lat"], pl["lon"]), popup=folium.Popup(_popup_html(pl), max_width=300))
+        marker.add_to(marker_cluster or fmap)
+    return "markers"
+
+def _render_map(
+    places: List[Dict],
+    map_center,
+    zoom_start: int,
+    cluster_markers: bool,
+    render_mode: str,
+    html_only: bool,
+    save_to: Optional[str],
+    open_browser: bool,
+) -> Dict:
+    """
+    Build the folium map and save/render it. Blocking - runs in _thread_executor.
+    Returns {'html': ...} when html_only, else {'path', 'render_mode', 'browser_opened'}.
+    """
+    import folium
+
+    fmap = folium.Map(location=map_center, zoom_start=zoom_start, control_scale=True)
+    used_render_mode = _add_markers(fmap, places, cluster_markers, render_mode)
+
+    if html_only:
+        # return only HTML content without saving file
+        return {"html": fmap._repr_html_(), "render_mode": used_render_mode}
+
+    # 현재 파일의 디렉토리를 기준으로 maps 폴더 경로 설정
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    maps_dir = os.path.join(current_dir, "..", "maps")
+    os.makedirs(maps_dir, exist_ok=True)
+
+    if not save_to:
+        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%fZ")
+        save_to = os.path.join(maps_dir, f"map_{timestamp}.html")
+    else:
+        # save_to가 상대 경로인 경우 maps 폴더 기준으로 절대 경로로 변환
+        if not os.path.isabs(save_to):
+            save_to = os.path.join(maps_dir, save_to)
+
+    fmap.save(save_to)
+
+    browser_opened = False
+    if open_browser:
+        import webbrowser
+        try:
+            browser_opened = webbrowser.open(f"file://{save_to}")
+        except Exception:
+            browser_opened = False
+
+    return {"path": save_to, "render_mode": used_render_mode, "browser_opened": browser_opened}
+
 async def places_to_map(
     places: Annotated[List[str], "검색할 장소 이름 리스트"],
     center: Optional[Dict[str, float]] = None,
@@ -32,6 +181,11 @@ async def places_to_map(
     save_to: Optional[str] = None,  # optional output filepath; if None, saves to /tmp
     cluster_markers: bool = True,
     html_only: bool = False,  # if True, return only HTML content without saving file
+    bbox: Optional[Dict[str, float]] = None,
+    polygon: Optional[List[List[float]]] = None,
+    exact_distance: bool = False,  # if True, use geodesic distance for the radius filter
+    render_mode: str = "auto",  # "auto" | "markers" | "fast"
+    open_browser: bool = False,  # if True, open the saved map in the local browser
 ) -> str:
     """
     places: list of dicts, each dict may have:
@@ -42,85 +196,64 @@ async def places_to_map(
       - popup (optional)  # html/text for popup
     center: {'lat': .., 'lon': ..} optional - map center and for radius filter
     radius_m: if provided, only include places within radius_m meters of center
+    bbox: {'south': .., 'west': .., 'north': .., 'east': ..} optional - only include places inside
+    polygon: [[lat, lon], ...] optional - only include places inside the polygon
+    render_mode: "auto" switches to browser-side marker rendering above FAST_RENDER_THRESHOLD places
+    open_browser: open the saved file with webbrowser (off by default for headless servers)
     Returns: HTML string of the map (and also saves file under save_to or temp file).
     """
 
-    # 1) geocode missing coords (with polite delay)
-    resolved_places = []
-    for p in places:
-        
-        p_info = json.loads(await kakao.search_local_kakao(p))['documents'][0]
-        lat = p_info['y']
-        lon = p_info['x']
-        
-        candidate = {"name": p, "lat": float(lat), "lon": float(lon), "popup": ""}
-        # optional original metadata
-        candidate["meta"] = p
-        resolved_places.append(candidate)
-        # rate-limit politeness
-        await asyncio.sleep(0.2)
-
-    # 2) optional radius filter
-    if center and radius_m:
-        filtered = [pl for pl in resolved_places if _within_radius(center, {"lat":pl["lat"], "lon":pl["lon"]}, radius_m)]
-    else:
-        filtered = resolved_places
+    # 1) geocode places concurrently through the geocoder chain (Kakao address/keyword, then Nominatim)
+    geocoded = await geocoder.geocode_many(places)
+    resolved_places = [
+        {**pl, "popup": "", "meta": pl["name"]} for pl in geocoded if "error" not in pl
+    ]
+    failed_places = [pl for pl in geocoded if "error" in pl]
+
+    # 2) optional radius / bbox / polygon filter
+    filtered = _filter_places(resolved_places, center, radius_m, bbox, polygon, exact_distance)
 
     if not filtered:
-        return json.dumps({"error": "No resolvable places within constraints."}, ensure_ascii=False)
+        return json.dumps(
+            {"error": "No resolvable places within constraints.", "failed": failed_places},
+            ensure_ascii=False,
+        )
 
-    # 3) build folium map
+    # 3) build, save and (optionally) open the map in the render worker pool
+    global _pending_renders
+    if _pending_renders >= MAP_RENDER_QUEUE_SIZE:
+        return json.dumps(
+            {"error": f"Map render queue is full ({MAP_RENDER_QUEUE_SIZE} jobs). Try again later."},
+            ensure_ascii=False,
+        )
     map_center = (center["lat"], center["lon"]) if center else (filtered[0]["lat"], filtered[0]["lon"])
-    fmap = folium.Map(location=map_center, zoom_start=zoom_start, control_scale=True)
-    if cluster_markers:
-        marker_cluster = MarkerCluster().add_to(fmap)
-    else:
-        marker_cluster = None
-
-    for pl in filtered:
-        popup_html = f"<b>{pl['name']}</b><br/>{pl.get('popup','')}"
-        marker = folium.Marker(location=(pl["lat"], pl["lon"]), popup=folium.Popup(popup_html, max_width=300))
-        if marker_cluster:
-            marker.add_to(marker_cluster)
-        else:
-            marker.add_to(fmap)
+    _pending_renders += 1
+    try:
+        rendered = await asyncio.get_running_loop().run_in_executor(
+            _thread_executor,
+            _render_map,
+            filtered, map_center, zoom_start, cluster_markers, render_mode, html_only, save_to, open_browser,
+        )
+    finally:
+        _pending_renders -= 1
 
-    # 4) save HTML to file and also return HTML string
     if html_only:
-        # return only HTML content without saving file
-        return fmap._repr_html_()
-    
-    # 현재 파일의 디렉토리를 기준으로 maps 폴더 경로 설정
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    maps_dir = os.path.join(current_dir, "..", "maps")
-    os.makedirs(maps_dir, exist_ok=True)
-    
-    if not save_to:
-        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-        save_to = os.path.join(maps_dir, f"map_{timestamp}.html")
-    else:
-        # save_to가 상대 경로인 경우 maps 폴더 기준으로 절대 경로로 변환
-        if not os.path.isabs(save_to):
-            save_to = os.path.join(maps_dir, save_to)
+        return rendered["html"]
+    save_to = rendered["path"]
+    filename = os.path.basename(save_to)
+    used_render_mode = rendered["render_mode"]
+    browser_opened = rendered["browser_opened"]
 
-    fmap.save(save_to)
+    failed_text = "".join(
+        f"- 좌표를 찾지 못한 장소: {pl['name']} ({pl['error']})\n" for pl in failed_places
+    )
 
-    # 파일명만 추출 (경로에서)
-    filename = os.path.basename(save_to)
-    
-    # 자동으로 브라우저에서 열기 시도
-    try:
-        webbrowser.open(f"file://{save_to}")
-        browser_opened = True
-    except Exception:
-        browser_opened = False
-    
     # HTML 링크가 포함된 응답 생성
     response_text = f"""지도가 성공적으로 생성되었습니다!
 
 📍 **생성된 지도**: [{filename}](file://{save_to})
 
-{'✅ 브라우저에서 자동으로 열렸습니다!' if browser_opened else '💡 지도 파일을 클릭하시면 브라우저에서 열립니다.'}
+{'✅ 브라우저에서 열렸습니다!' if browser_opened else '💡 지도 파일을 클릭하시면 브라우저에서 열립니다.'}
 
 만약 클릭이 안 되시면 아래 경로를 복사해서 브라우저 주소창에 붙여넣어주세요:
 
@@ -128,9 +261,10 @@ async def places_to_map(
 
 **지도 정보:**
 - 총 {len(filtered)}개 장소 표시
-- 중심점: {map_center[0]:.6f}, {map_center[1]:.6f}
+{failed_text}- 중심점: {map_center[0]:.6f}, {map_center[1]:.6f}
 - 줌 레벨: {zoom_start}
 - 마커 클러스터링: {'활성화' if cluster_markers else '비활성화'}
+- 렌더링 모드: {'대용량(브라우저 렌더링)' if used_render_mode == 'fast' else '일반 마커'}
 
 지도에서 각 마커를 클릭하면 장소 정보를 확인할 수 있습니다."""
 
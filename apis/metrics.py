@@ -0,0 +1,312 @@
+import bisect
+import contextvars
+import json
+import logging
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from apis import breaker, cache, coalesce, quota
+
+
+# trace span 기록 여부와 메모리에 보관할 최근 trace 수
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "false").lower() in ("1", "true", "yes")
+TRACE_HISTORY = int(os.environ.get("TRACE_HISTORY", "50"))
+
+# 지연 시간 히스토그램 버킷 상한 (초, Prometheus 기본 버킷)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_PREFIX = "nl_map_search"
+
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels: Any) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 4)
+
+
+class Histogram:
+    """버킷 구간별 관측 수와 합계, 전체 개수를 기록하는 지연 시간 히스토그램입니다."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """버킷 안에서 선형 보간한 q 분위수(초)를 반환합니다. 관측값이 없으면 None."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else lower * 2 or 1.0
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": _round(self.quantile(0.5)),
+            "p95": _round(self.quantile(0.95)),
+            "p99": _round(self.quantile(0.99)),
+        }
+
+
+class Registry:
+    """이름과 label 조합별 counter와 histogram을 보관합니다."""
+
+    def __init__(self):
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.help: Dict[str, str] = {}
+
+    def describe(self, name: str, text: str) -> None:
+        self.help[name] = text
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        series = self.counters.setdefault(name, {})
+        key = _labels(**labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        series = self.histograms.setdefault(name, {})
+        key = _labels(**labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        return self.histograms.get(name, {}).get(_labels(**labels))
+
+    def clear(self) -> None:
+        self.counters.clear()
+        self.histograms.clear()
+
+
+registry = Registry()
+registry.describe("upstream_request_duration_seconds", "provider API 요청 한 번(재시도 시도 각각)의 지연 시간")
+registry.describe("upstream_requests_total", "provider API 요청 수 (status: HTTP 상태 코드 또는 transport_error)")
+registry.describe("upstream_retries_total", "429/5xx/연결 오류로 재시도한 provider API 요청 수")
+registry.describe("upstream_request_bytes_total", "provider API 요청 본문 크기 합계")
+registry.describe("upstream_response_bytes_total", "provider API 응답 본문 크기 합계")
+registry.describe("upstream_hedged_requests_total", "p95를 넘겨 hedged request를 보낸 요청 수 (winner: primary 또는 hedge)")
+registry.describe("tool_duration_seconds", "MCP 도구 호출 지연 시간")
+registry.describe("tool_calls_total", "MCP 도구 호출 수 (status: ok 또는 error)")
+
+
+def record_upstream(
+    provider: str,
+    endpoint: str,
+    status: str,
+    seconds: float,
+    request_bytes: int = 0,
+    response_bytes: int = 0
+) -> None:
+    """provider API 요청 한 번의 지연 시간, 상태 코드, 주고받은 바이트 수를 기록합니다."""
+    registry.observe("upstream_request_duration_seconds", seconds, provider=provider, endpoint=endpoint)
+    registry.inc("upstream_requests_total", provider=provider, endpoint=endpoint, status=status)
+    if request_bytes:
+        registry.inc("upstream_request_bytes_total", request_bytes, provider=provider, endpoint=endpoint)
+    if response_bytes:
+        registry.inc("upstream_response_bytes_total", response_bytes, provider=provider, endpoint=endpoint)
+
+
+def record_retry(provider: str, endpoint: str) -> None:
+    registry.inc("upstream_retries_total", provider=provider, endpoint=endpoint)
+
+
+def record_hedge(provider: str, endpoint: str, winner: str) -> None:
+    registry.inc("upstream_hedged_requests_total", provider=provider, endpoint=endpoint, winner=winner)
+
+
+def record_tool(tool: str, status: str, seconds: float) -> None:
+    registry.observe("tool_duration_seconds", seconds, tool=tool)
+    registry.inc("tool_calls_total", tool=tool, status=status)
+
+
+# ---- trace span ----
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    attributes: Dict[str, Any]
+    start: float
+    duration_ms: Optional[float] = None
+    children: List["Span"] = field(default_factory=list)
+
+    def to_dict(self, origin: Optional[float] = None) -> Dict[str, Any]:
+        origin = self.start if origin is None else origin
+        result = {
+            "name": self.name,
+            "offset_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": self.duration_ms,
+            **self.attributes,
+        }
+        if self.children:
+            result["children"] = [child.to_dict(origin) for child in self.children]
+        return result
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+recent_traces: Deque[Dict[str, Any]] = deque(maxlen=TRACE_HISTORY)
+
+
+@contextmanager
+def span(name: str, root: bool = False, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    trace span을 기록합니다. TRACING_ENABLED가 꺼져 있거나, root가 아닌데 진행 중인 trace가 없으면 아무것도 하지 않습니다.
+    root span이 끝나면 전체 trace를 recent_traces에 보관하고 DEBUG 로그로 남깁니다.
+    asyncio task는 생성 시점의 context를 복사하므로 gather로 띄운 요청도 같은 trace에 연결됩니다.
+
+    Args:
+        name (str): span 이름 (예: "tool", "upstream")
+        root (bool): 새 trace를 시작할지 여부
+        **attributes: span에 남길 속성 (provider, endpoint 등)
+
+    Yields:
+        Optional[Span]: 기록 중인 span (기록하지 않으면 None). attributes에 결과를 추가할 수 있습니다.
+    """
+    parent = _current_span.get()
+    if not TRACING_ENABLED or (parent is None and not root):
+        yield None
+        return
+
+    current = Span(name=name, attributes=attributes, start=time.perf_counter())
+    if parent is not None and not root:
+        parent.children.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        current.duration_ms = round((time.perf_counter() - current.start) * 1000, 2)
+        _current_span.reset(token)
+        if root:
+            trace = current.to_dict()
+            recent_traces.append(trace)
+            logger.debug("trace %s", json.dumps(trace, ensure_ascii=False, separators=(",", ":")))
+
+
+# ---- 출력 ----
+
+def _label_text(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _cache_counters() -> Dict[str, Dict[str, float]]:
+    return {
+        "response_cache_events_total": dict(cache.response_cache.counters),
+        "route_cache_events_total": dict(cache.route_cache.counters),
+        "single_flight_requests_total": dict(coalesce.single_flight.counters),
+    }
+
+
+def _number(value: float) -> str:
+    """Prometheus 샘플 값을 정밀도 손실 없이 표기합니다 (정수 값은 정수로)."""
+    value = float(value)
+    if value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def prometheus_text() -> str:
+    """모든 지표를 Prometheus text exposition 형식으로 반환합니다."""
+    lines = []
+    for name, series in registry.counters.items():
+        metric = f"{_PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {registry.help.get(name, name)}")
+        lines.append(f"# TYPE {metric} counter")
+        lines += [f"{metric}{_label_text(labels)} {_number(value)}" for labels, value in sorted(series.items())]
+
+    for name, series in registry.histograms.items():
+        metric = f"{_PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {registry.help.get(name, name)}")
+        lines.append(f"# TYPE {metric} histogram")
+        for labels, histogram in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{metric}_bucket{_label_text(labels, (('le', le),))} {cumulative}")
+            lines.append(f"{metric}_sum{_label_text(labels)} {_number(histogram.sum)}")
+            lines.append(f"{metric}_count{_label_text(labels)} {histogram.count}")
+
+    label_names = {"response_cache_events_total": "event", "route_cache_events_total": "event", "single_flight_requests_total": "role"}
+    for name, values in _cache_counters().items():
+        metric = f"{_PREFIX}_{name}"
+        lines.append(f"# TYPE {metric} counter")
+        lines += [f"{metric}{_label_text(((label_names[name], key),))} {_number(value)}" for key, value in values.items()]
+
+    lines.append(f"# TYPE {_PREFIX}_circuit_breaker_open gauge")
+    for provider, state in breaker.stats().items():
+        lines.append(f"{_PREFIX}_circuit_breaker_open{_label_text((('provider', provider),))} {int(state['state'] != breaker.CLOSED)}")
+
+    lines.append(f"# TYPE {_PREFIX}_quota_used gauge")
+    for provider, usage in quota.quota_manager.stats().items():
+        lines.append(f"{_PREFIX}_quota_used{_label_text((('provider', provider),))} {usage['used']}")
+    return "\n".join(lines) + "\n"
+
+
+def snapshot() -> Dict[str, Any]:
+    """MCP 리소스로 보여줄 지표 요약 (분위수는 히스토그램 버킷에서 추정한 초 단위 값)"""
+    upstream: Dict[str, Dict[str, Any]] = {}
+    for labels, histogram in registry.histograms.get("upstream_request_duration_seconds", {}).items():
+        upstream["{provider}.{endpoint}".format(**dict(labels))] = {"latency": histogram.snapshot(), "status": {}}
+    for name in (
+        "upstream_requests_total", "upstream_retries_total", "upstream_hedged_requests_total",
+        "upstream_request_bytes_total", "upstream_response_bytes_total",
+    ):
+        for labels, value in registry.counters.get(name, {}).items():
+            label_map = dict(labels)
+            entry = upstream.setdefault("{provider}.{endpoint}".format(**label_map), {"status": {}})
+            if name == "upstream_requests_total":
+                entry["status"][label_map["status"]] = int(value)
+            elif name == "upstream_hedged_requests_total":
+                entry.setdefault("hedged", {})[label_map["winner"]] = int(value)
+            else:
+                entry[name.replace("upstream_", "").replace("_total", "")] = int(value)
+
+    tools: Dict[str, Dict[str, Any]] = {}
+    for labels, histogram in registry.histograms.get("tool_duration_seconds", {}).items():
+        tools[dict(labels)["tool"]] = {"latency": histogram.snapshot(), "status": {}}
+    for labels, value in registry.counters.get("tool_calls_total", {}).items():
+        label_map = dict(labels)
+        tools.setdefault(label_map["tool"], {"status": {}})["status"][label_map["status"]] = int(value)
+
+    flight = coalesce.single_flight.counters
+    flights = flight["leaders"] + flight["followers"]
+    return {
+        "upstream": upstream,
+        "tools": tools,
+        "response_cache": cache.response_cache.stats(),
+        "route_cache": cache.route_cache.stats(),
+        "single_flight": {**coalesce.single_flight.stats(), "coalesce_rate": flight["followers"] / flights if flights else 0.0},
+        "circuit_breakers": breaker.stats(),
+        "tracing": {"enabled": TRACING_ENABLED, "recent": len(recent_traces)},
+    }
@@ -1,7 +1,8 @@
 import os
-import httpx
 from typing import Dict, Any
 
+from apis import cache, coalesce, http
+
 
 NAVER_CLIENT_ID = os.environ.get("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = os.environ.get("NAVER_CLIENT_SECRET")
@@ -12,6 +13,8 @@ NAVER_API_HEADERS = {
 NAVER_API_ENDPOINT = "https://openapi.naver.com/v1"
 
 
+@cache.cached("naver", "blog")
+@coalesce.coalesced("naver", "blog")
 async def search_blog_naver(
     query: str,
     display: int = 10,
@@ -31,21 +34,24 @@ async def search_blog_naver(
     Returns:
         str: 블로그 검색 결과 JSON 문자열
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{NAVER_API_ENDPOINT}/search/blog.json",
-            params={
-                "query": query,
-                "display": display,
-                "start": start,
-                "sort": sort,
-            },
-            headers=NAVER_API_HEADERS,
-        )
-        response.raise_for_status()
-        return response.text
+    response = await http.request(
+        "naver",
+        "GET",
+        f"{NAVER_API_ENDPOINT}/search/blog.json",
+        endpoint="blog",
+        params={
+            "query": query,
+            "display": display,
+            "start": start,
+            "sort": sort,
+        },
+        headers=NAVER_API_HEADERS,
+    )
+    return response.text
 
 
+@cache.cached("naver", "local")
+@coalesce.coalesced("naver", "local")
 async def search_local_naver(
     query: str,
     display: int = 10,
@@ -65,21 +71,24 @@ async def search_local_naver(
     Returns:
         str: 지역 검색 결과 JSON 문자열
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{NAVER_API_ENDPOINT}/search/local.json",
-            params={
-                "query": query,
-                "display": display,
-                "start": start,
-                "sort": sort,
-            },
-            headers=NAVER_API_HEADERS,
-        )
-        response.raise_for_status()
-        return response.text
+    response = await http.request(
+        "naver",
+        "GET",
+        f"{NAVER_API_ENDPOINT}/search/local.json",
+        endpoint="local",
+        params={
+            "query": query,
+            "display": display,
+            "start": start,
+            "sort": sort,
+        },
+        headers=NAVER_API_HEADERS,
+    )
+    return response.text
 
 
+@cache.cached("naver", "webkr")
+@coalesce.coalesced("naver", "webkr")
 async def search_web_naver(
     query: str,
     display: int = 10,
@@ -97,15 +106,16 @@ async def search_web_naver(
     Returns:
         str: 웹 검색 결과 JSON 문자열
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{NAVER_API_ENDPOINT}/search/webkr.json",
-            params={
-                "query": query,
-                "display": display,
-                "start": start,
-            },
-            headers=NAVER_API_HEADERS,
-        )
-        response.raise_for_status()
-        return response.text
\ No newline at end of file
+    response = await http.request(
+        "naver",
+        "GET",
+        f"{NAVER_API_ENDPOINT}/search/webkr.json",
+        endpoint="webkr",
+        params={
+            "query": query,
+            "display": display,
+            "start": start,
+        },
+        headers=NAVER_API_HEADERS,
+    )
+    return response.text
\ No newline at end of file
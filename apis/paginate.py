@@ -0,0 +1,140 @@
+import asyncio
+import math
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+# 네이버 검색 API의 페이지 크기(display)와 시작 위치(start) 최대값
+NAVER_PAGE_SIZE = 100
+NAVER_MAX_START = 1000
+
+FetchPage = Callable[[int, int], Awaitable[List[Any]]]
+OnPage = Callable[[int, List[Any], int], Awaitable[None]]
+
+
+class PageResults(list):
+    """
+    fetch_pages의 결과 목록입니다.
+    요청에 실패한 페이지가 있으면 failed_pages에 {시작 위치: 오류 메시지}로 담습니다.
+    """
+
+    def __init__(self, items: List[Any], failed_pages: Optional[Dict[int, str]] = None):
+        super().__init__(items)
+        self.failed_pages = failed_pages or {}
+
+
+def _page_starts(first_start: int, count: int, page_size: int, max_start: int) -> List[int]:
+    starts = [first_start + page_size * index for index in range(count)]
+    return [start for start in starts if start <= max_start]
+
+
+async def fetch_pages(
+    fetch_page: FetchPage,
+    max_results: int,
+    key: Callable[[Any], Any],
+    start: int = 1,
+    page_size: int = NAVER_PAGE_SIZE,
+    max_start: int = NAVER_MAX_START,
+    on_page: Optional[OnPage] = None
+) -> PageResults:
+    """
+    max_results개의 고유한 결과가 모일 때까지 필요한 페이지를 동시에 요청합니다.
+    요청 속도는 provider rate limiter(apis.ratelimit)가 제한하므로 여기서는 페이지를 한 번에 띄웁니다.
+
+    페이지는 도착하는 순서대로 on_page로 전달되며, 앞에서부터 연속으로 도착한 페이지만으로
+    고유 결과가 max_results개를 넘으면 남은 요청은 취소합니다.
+    중복 때문에 부족하면 부족한 만큼 다음 페이지를 이어서 요청합니다.
+
+    실패한 페이지는 결과의 끝으로 보지 않고 failed_pages에 기록하며, 나머지 페이지의 결과는 그대로 반환합니다.
+    페이지가 도착한 순서와 관계없이 모든 페이지가 실패한 경우에만 예외를 발생시킵니다.
+
+    Args:
+        fetch_page (Callable): (start, display)를 받아 결과 목록을 반환하는 코루틴 함수
+        max_results (int): 모을 고유 결과 수
+        key (Callable): 중복 판정에 사용할 결과의 키 (예: URL)
+        start (int): 첫 페이지 시작 위치
+        page_size (int): 페이지당 결과 수
+        max_start (int): provider가 허용하는 최대 시작 위치
+        on_page (Callable, optional): (start, 새로 추가된 결과, 누적 고유 결과 수)를 받는 코루틴 함수
+
+    Returns:
+        PageResults: 시작 위치 순서로 정렬된 고유 결과 목록 (최대 max_results개)과 실패한 페이지
+
+    Raises:
+        Exception: 요청한 모든 페이지가 실패한 경우 첫 페이지의 오류
+    """
+    pages: Dict[int, List[Any]] = {}
+    failures: Dict[int, BaseException] = {}
+    seen = set()
+    next_start = start
+    exhausted = False
+
+    def contiguous_unique() -> int:
+        """첫 페이지부터 빈틈없이 도착한(실패한 페이지 포함) 페이지들의 고유 결과 수"""
+        keys = set()
+        page_start = start
+        while page_start in pages or page_start in failures:
+            keys.update(key(item) for item in pages.get(page_start, []))
+            page_start += page_size
+        return len(keys)
+
+    # 실패한 페이지가 생기면 빈자리를 메우려고 다음 페이지를 더 요청하지 않습니다.
+    while not exhausted and not failures and len(seen) < max_results:
+        count = math.ceil((max_results - len(seen)) / page_size)
+        starts = _page_starts(next_start, count, page_size, max_start)
+        if not starts:
+            break
+        next_start = starts[-1] + page_size
+
+        tasks = {
+            asyncio.ensure_future(fetch_page(page_start, page_size)): page_start
+            for page_start in starts
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.get):
+                    page_start = tasks[task]
+                    if task.exception() is not None:
+                        failures[page_start] = task.exception()
+                        continue
+                    items = task.result()
+                    pages[page_start] = items
+
+                    # 결과가 한 페이지보다 적으면 마지막 페이지이므로 뒤쪽 페이지 요청은 취소합니다.
+                    if len(items) < page_size:
+                        exhausted = True
+                        for other in [other for other in pending if tasks[other] > page_start]:
+                            other.cancel()
+                            pending.discard(other)
+
+                    added = []
+                    for item in items:
+                        item_key = key(item)
+                        if item_key not in seen:
+                            seen.add(item_key)
+                            added.append(item)
+                    if on_page is not None:
+                        await on_page(page_start, added, len(seen))
+
+                if contiguous_unique() >= max_results:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+    if failures and not pages:
+        raise failures[min(failures)]
+
+    results = []
+    keys = set()
+    for page_start in sorted(pages):
+        for item in pages[page_start]:
+            item_key = key(item)
+            if item_key not in keys:
+                keys.add(item_key)
+                results.append(item)
+    return PageResults(
+        results[:max_results],
+        {page_start: f"{type(error).__name__}: {error}" for page_start, error in sorted(failures.items())},
+    )
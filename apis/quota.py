@@ -0,0 +1,190 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from apis import ratelimit
+
+
+QUOTA_STATE_PATH = os.environ.get(
+    "QUOTA_STATE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "nl_map_search", "quota.sqlite3"),
+)
+
+# 메모리의 사용량을 SQLite에 저장하는 간격 (초)
+QUOTA_FLUSH_INTERVAL = float(os.environ.get("QUOTA_FLUSH_INTERVAL", "5"))
+
+# provider별 일일 한도 (YouTube는 quota unit 기준)
+DAILY_QUOTAS = {
+    "naver": int(os.environ.get("NAVER_DAILY_QUOTA", "25000")),
+    "kakao": int(os.environ.get("KAKAO_DAILY_QUOTA", "100000")),
+    "google": int(os.environ.get("GOOGLE_DAILY_QUOTA", "100")),
+    "youtube": int(os.environ.get("YOUTUBE_DAILY_QUOTA", "10000")),
+}
+
+# 엔드포인트별 비용 (명시되지 않은 엔드포인트는 1)
+ENDPOINT_COSTS = {
+    ("youtube", "search"): 100,
+    ("youtube", "videos"): 1,
+}
+
+
+def _pacific_timezone() -> timezone:
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo("America/Los_Angeles")
+    except Exception:
+        return timezone(timedelta(hours=-8))
+
+
+# 일일 한도가 초기화되는 기준 시간대
+_KST = timezone(timedelta(hours=9))
+_PACIFIC = _pacific_timezone()
+QUOTA_TIMEZONES = {
+    "naver": _KST,
+    "kakao": _KST,
+    "google": _PACIFIC,
+    "youtube": _PACIFIC,
+}
+
+
+class QuotaExceededError(Exception):
+    """provider의 일일 한도를 초과하여 요청을 보낼 수 없을 때 발생합니다."""
+
+
+class QuotaManager:
+    """
+    provider별 일일 사용량을 추적하고 초당 요청 수를 제한합니다.
+    일일 한도를 넘는 요청은 보내기 전에 거절하며, 사용량은 SQLite에 저장되어 재시작 후에도 유지됩니다.
+    요청마다 디스크에 쓰지 않도록 사용량은 메모리에서 세고, flush_interval마다 작업자 스레드에서
+    모아서 저장합니다. 종료 시에도 남은 사용량을 저장합니다.
+    """
+
+    def __init__(self, path: Optional[str] = QUOTA_STATE_PATH, flush_interval: float = QUOTA_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._usage: Dict[Tuple[str, str], int] = {}
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quota")
+        self._last_flush = time.monotonic()
+        self._flush_scheduled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._db is None and self.path:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS usage ("
+                "provider TEXT, day TEXT, units INTEGER, PRIMARY KEY (provider, day))"
+            )
+            self._db.commit()
+        return self._db
+
+    @staticmethod
+    def _today(provider: str) -> str:
+        return datetime.now(QUOTA_TIMEZONES.get(provider, _KST)).strftime("%Y-%m-%d")
+
+    def used(self, provider: str) -> int:
+        """provider의 오늘 사용량을 반환합니다."""
+        key = (provider, self._today(provider))
+        with self._lock:
+            if key in self._usage:
+                return self._usage[key]
+        # 날짜가 바뀐 뒤 처음 한 번만 디스크에서 읽습니다 (flush와 같은 순서로 잠금을 잡도록 _lock 밖에서 읽음).
+        with self._db_lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT units FROM usage WHERE provider = ? AND day = ?", key
+            ).fetchone() if db is not None else None
+        with self._lock:
+            return self._usage.setdefault(key, row[0] if row else 0)
+
+    def _consume(self, provider: str, cost: int) -> None:
+        limit = DAILY_QUOTAS.get(provider)
+        used = self.used(provider)
+        if limit is not None and used + cost > limit:
+            raise QuotaExceededError(
+                f"{provider} 일일 한도를 초과했습니다 ({used}/{limit}, 요청 비용 {cost})."
+            )
+        key = (provider, self._today(provider))
+        with self._lock:
+            self._usage[key] = self._usage.get(key, 0) + cost
+            if not self.path:
+                return
+            self._pending[key] = self._pending.get(key, 0) + cost
+            if self._flush_scheduled or time.monotonic() - self._last_flush < self.flush_interval:
+                return
+            self._flush_scheduled = True
+        self._writer.submit(self.flush)
+
+    def flush(self) -> None:
+        """아직 저장하지 않은 사용량을 SQLite에 저장합니다. 다른 스레드가 저장 중이면 끝날 때까지 기다립니다."""
+        with self._db_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._last_flush = time.monotonic()
+                self._flush_scheduled = False
+            if not pending:
+                return
+            db = self._connect()
+            if db is None:
+                return
+            db.executemany(
+                "INSERT INTO usage (provider, day, units) VALUES (?, ?, ?) "
+                "ON CONFLICT(provider, day) DO UPDATE SET units = units + excluded.units",
+                [(provider, day, units) for (provider, day), units in pending.items()],
+            )
+            db.commit()
+
+    async def reserve(self, provider: str, endpoint: str) -> None:
+        """
+        요청 한 건을 보내기 전에 호출합니다.
+        일일 한도를 넘으면 QuotaExceededError를 발생시키고, 초당 한도에 걸리면 대기합니다.
+
+        Args:
+            provider (str): provider 이름
+            endpoint (str): 엔드포인트 이름 (YouTube 비용 계산에 사용)
+        """
+        cost = ENDPOINT_COSTS.get((provider, endpoint), 1)
+        self._consume(provider, cost)
+        await ratelimit.acquire(provider)
+
+    def try_reserve(self, provider: str, endpoint: str) -> bool:
+        """
+        기다리지 않고 요청 한 건을 예약합니다 (hedged request용).
+        일일 한도를 넘거나 초당 한도 토큰이 바로 없으면 사용량을 늘리지 않고 False를 반환합니다.
+
+        Args:
+            provider (str): provider 이름
+            endpoint (str): 엔드포인트 이름
+
+        Returns:
+            bool: 예약에 성공하면 True
+        """
+        cost = ENDPOINT_COSTS.get((provider, endpoint), 1)
+        limit = DAILY_QUOTAS.get(provider)
+        if limit is not None and self.used(provider) + cost > limit:
+            return False
+        if not ratelimit.try_acquire(provider):
+            return False
+        self._consume(provider, cost)
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """provider별 오늘 사용량과 한도를 반환합니다."""
+        return {
+            provider: {"used": self.used(provider), "limit": limit}
+            for provider, limit in DAILY_QUOTAS.items()
+        }
+
+
+quota_manager = QuotaManager()
+atexit.register(quota_manager.flush)
@@ -0,0 +1,75 @@
+import asyncio
+import os
+import time
+from typing import Dict, Optional
+
+
+# provider별 초당 요청 한도 (환경변수로 조정 가능)
+PROVIDER_RATES = {
+    "naver": float(os.environ.get("NAVER_RATE_PER_SEC", "10")),
+    "kakao": float(os.environ.get("KAKAO_RATE_PER_SEC", "10")),
+    "google": float(os.environ.get("GOOGLE_RATE_PER_SEC", "5")),
+    "youtube": float(os.environ.get("YOUTUBE_RATE_PER_SEC", "5")),
+    # Nominatim 이용 정책: 초당 1건 이하
+    "nominatim": float(os.environ.get("NOMINATIM_RATE_PER_SEC", "1")),
+}
+
+
+class TokenBucket:
+    """
+    초당 rate개의 토큰이 채워지는 토큰 버킷입니다.
+    capacity만큼의 순간 요청(burst)을 허용하고, 그 이후에는 rate에 맞춰 대기합니다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """토큰을 얻을 때까지 대기합니다. 대기 순서는 호출 순서를 따릅니다."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """토큰이 바로 있으면 얻고 True, 없거나 다른 호출자가 대기 중이면 기다리지 않고 False를 반환합니다."""
+        if self._lock.locked():
+            return False
+        self._refill()
+        if self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        return True
+
+
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def get_bucket(provider: str) -> TokenBucket:
+    """provider별로 공유되는 토큰 버킷을 반환합니다."""
+    bucket = _buckets.get(provider)
+    if bucket is None:
+        bucket = TokenBucket(PROVIDER_RATES.get(provider, 10.0))
+        _buckets[provider] = bucket
+    return bucket
+
+
+async def acquire(provider: str) -> None:
+    """provider의 초당 요청 한도에 맞춰 요청 한 건을 허가받습니다."""
+    await get_bucket(provider).acquire()
+
+
+def try_acquire(provider: str) -> bool:
+    """provider의 초당 요청 한도 안에서 기다리지 않고 요청 한 건을 허가받을 수 있으면 True"""
+    return get_bucket(provider).try_acquire()
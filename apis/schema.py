@@ -0,0 +1,214 @@
+import html
+import json
+import re
+from dataclasses import dataclass, fields as dataclass_fields
+from typing import Any, Dict, List, Optional, Sequence
+
+_TAG = re.compile(r"<[^>]+>")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def clean_text(value: Optional[str]) -> Optional[str]:
+    """<b> 강조 태그와 HTML 엔티티, 불필요한 공백을 제거합니다."""
+    if value is None:
+        return None
+    return _WHITESPACE.sub(" ", html.unescape(_TAG.sub("", value))).strip() or None
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class WebDoc:
+    source: str
+    title: Optional[str]
+    url: Optional[str]
+    snippet: Optional[str] = None
+    date: Optional[str] = None
+
+
+@dataclass(slots=True)
+class BlogPost:
+    source: str
+    title: Optional[str]
+    url: Optional[str]
+    snippet: Optional[str] = None
+    author: Optional[str] = None
+    date: Optional[str] = None
+
+
+@dataclass(slots=True)
+class LocalPlace:
+    source: str
+    name: Optional[str]
+    address: Optional[str] = None
+    road_address: Optional[str] = None
+    phone: Optional[str] = None
+    category: Optional[str] = None
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    url: Optional[str] = None
+
+
+@dataclass(slots=True)
+class Video:
+    source: str
+    video_id: str
+    title: Optional[str]
+    url: Optional[str]
+    channel: Optional[str] = None
+    published_at: Optional[str] = None
+    description: Optional[str] = None
+    duration: Optional[str] = None
+    views: Optional[int] = None
+    likes: Optional[int] = None
+
+
+def to_dict(item: Any, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    결과 객체를 딕셔너리로 변환합니다. 값이 없는 항목은 생략합니다.
+
+    Args:
+        item: WebDoc, BlogPost, LocalPlace, Video 중 하나
+        fields (Sequence[str], optional): 포함할 속성 이름 목록 (None이면 전체)
+
+    Returns:
+        Dict[str, Any]: 속성 딕셔너리
+    """
+    names = fields or [field.name for field in dataclass_fields(item)]
+    result = {}
+    for name in names:
+        value = getattr(item, name, None)
+        if value is None or (isinstance(value, (str, list, dict)) and not value):
+            continue
+        result[name] = value
+    return result
+
+
+def dumps(payload: Any) -> str:
+    """공백 없는 compact JSON 문자열로 직렬화합니다."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def parse_naver_blog(response_text: str) -> List[BlogPost]:
+    """네이버 블로그 검색 응답을 BlogPost 목록으로 변환합니다."""
+    return [
+        BlogPost(
+            source="naver",
+            title=clean_text(item.get("title")),
+            url=item.get("link"),
+            snippet=clean_text(item.get("description")),
+            author=item.get("bloggername"),
+            date=item.get("postdate"),
+        )
+        for item in json.loads(response_text).get("items", [])
+    ]
+
+
+def parse_naver_web(response_text: str) -> List[WebDoc]:
+    """네이버 웹 문서 검색 응답을 WebDoc 목록으로 변환합니다."""
+    return [
+        WebDoc(
+            source="naver",
+            title=clean_text(item.get("title")),
+            url=item.get("link"),
+            snippet=clean_text(item.get("description")),
+        )
+        for item in json.loads(response_text).get("items", [])
+    ]
+
+
+def parse_naver_local(response_text: str) -> List[LocalPlace]:
+    """
+    네이버 지역 검색 응답을 LocalPlace 목록으로 변환합니다.
+    mapx/mapy는 WGS84 경위도에 10^7을 곱한 정수이므로 경위도로 환산합니다.
+    """
+    places = []
+    for item in json.loads(response_text).get("items", []):
+        mapx, mapy = _float(item.get("mapx")), _float(item.get("mapy"))
+        places.append(LocalPlace(
+            source="naver",
+            name=clean_text(item.get("title")),
+            address=item.get("address"),
+            road_address=item.get("roadAddress"),
+            phone=item.get("telephone"),
+            category=item.get("category"),
+            lat=mapy / 1e7 if mapy is not None else None,
+            lon=mapx / 1e7 if mapx is not None else None,
+            url=item.get("link"),
+        ))
+    return places
+
+
+def parse_kakao_local(response_text: str) -> List[LocalPlace]:
+    """카카오 키워드 장소 검색 응답을 LocalPlace 목록으로 변환합니다."""
+    return [
+        LocalPlace(
+            source="kakao",
+            name=doc.get("place_name"),
+            address=doc.get("address_name"),
+            road_address=doc.get("road_address_name"),
+            phone=doc.get("phone"),
+            category=doc.get("category_name"),
+            lat=_float(doc.get("y")),
+            lon=_float(doc.get("x")),
+            url=doc.get("place_url"),
+        )
+        for doc in json.loads(response_text).get("documents", [])
+    ]
+
+
+def parse_kakao_web(response_text: str) -> List[WebDoc]:
+    """카카오 웹 문서 검색 응답을 WebDoc 목록으로 변환합니다."""
+    return [
+        WebDoc(
+            source="kakao",
+            title=clean_text(doc.get("title")),
+            url=doc.get("url"),
+            snippet=clean_text(doc.get("contents")),
+            date=doc.get("datetime"),
+        )
+        for doc in json.loads(response_text).get("documents", [])
+    ]
+
+
+def parse_google_web(response_text: str) -> List[WebDoc]:
+    """Google Custom Search 응답을 WebDoc 목록으로 변환합니다."""
+    return [
+        WebDoc(
+            source="google",
+            title=clean_text(item.get("title")),
+            url=item.get("link"),
+            snippet=clean_text(item.get("snippet")),
+        )
+        for item in json.loads(response_text).get("items", [])
+    ]
+
+
+def parse_youtube_videos(search_data: Dict[str, Any]) -> List[Video]:
+    """YouTube 검색 결과(상세 정보 포함)를 Video 목록으로 변환합니다."""
+    videos = []
+    for item in search_data.get("items", []):
+        video_id = item.get("id", {}).get("videoId")
+        if not video_id:
+            continue
+        snippet = item.get("snippet", {})
+        detail = item.get("detail") or {}
+        statistics = detail.get("statistics", {})
+        videos.append(Video(
+            source="youtube",
+            video_id=video_id,
+            title=clean_text(snippet.get("title")),
+            url=f"https://www.youtube.com/watch?v={video_id}",
+            channel=snippet.get("channelTitle"),
+            published_at=snippet.get("publishedAt"),
+            description=clean_text(detail.get("snippet", {}).get("description") or snippet.get("description")),
+            duration=detail.get("contentDetails", {}).get("duration"),
+            views=int(statistics["viewCount"]) if "viewCount" in statistics else None,
+            likes=int(statistics["likeCount"]) if "likeCount" in statistics else None,
+        ))
+    return videos
@@ -1,54 +1,113 @@
-import json
+import asyncio
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
-import httpx
+from apis import cache, coalesce, http
 
 
 YOUTUBE_API_KEY = os.environ.get("YOUTUBE_API_KEY")
+YOUTUBE_API_ENDPOINT = "https://www.googleapis.com/youtube/v3"
 
+# /videos 엔드포인트는 한 번에 최대 50개의 ID를 받습니다.
+VIDEOS_PAGE_SIZE = 50
 
+# enrich 수준별 /videos part 값
+ENRICH_PARTS = {
+    "none": None,
+    "stats": "statistics,contentDetails",
+    "full": "snippet,statistics,contentDetails",
+}
+
+
+@cache.cached("youtube", "search")
+@coalesce.coalesced("youtube", "search")
 async def search_videos_youtube(
     query: str,
-    max_results: int = 10
+    max_results: int = 10,
+    enrich: str = "full",
+    parts: Optional[str] = None
 ) -> Dict[str, Any]:
     """
-    YouTube에서 동영상을 검색하고 상세 정보와 자막을 포함하여 반환합니다.
+    YouTube에서 동영상을 검색하고 상세 정보를 포함하여 반환합니다.
+    상세 정보는 검색 결과의 동영상 ID를 모아 /videos 엔드포인트에 일괄 요청합니다.
 
     Args:
         query (str): 검색할 키워드나 문구
         max_results (int): 검색 결과 개수 (기본값: 10)
+        enrich (str): 상세 정보 수준 - "none"(없음), "stats"(통계/길이), "full"(전체) (기본값: "full")
+        parts (str, optional): /videos 요청의 part 값을 직접 지정 (enrich 설정보다 우선)
 
     Returns:
         Dict[str, Any]: 동영상 검색 결과와 상세 정보가 포함된 딕셔너리
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://www.googleapis.com/youtube/v3/search",
+    if enrich not in ENRICH_PARTS:
+        raise ValueError(f"enrich must be one of {list(ENRICH_PARTS)}")
+
+    response = await http.request(
+        "youtube",
+        "GET",
+        f"{YOUTUBE_API_ENDPOINT}/search",
+        endpoint="search",
+        params={
+            "part": "snippet",
+            "q": query,
+            "key": YOUTUBE_API_KEY,
+            "maxResults": max_results,
+            "type": "video"
+        }
+    )
+
+    search_data = response.json()
+
+    parts = parts or ENRICH_PARTS[enrich]
+    if not parts:
+        return search_data
+
+    videos = [video for video in search_data.get("items", []) if "videoId" in video["id"]]
+    details = await get_videos_batch([video["id"]["videoId"] for video in videos], parts)
+    for video in videos:
+        video["detail"] = details.get(video["id"]["videoId"])
+
+    return search_data
+
+
+async def get_videos_batch(
+    video_ids: List[str],
+    parts: str = "snippet,statistics,contentDetails"
+) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 YouTube 동영상의 상세 정보를 한 번에 가져옵니다.
+    중복 ID는 제거하고, 최대 50개씩 묶어 동시에 요청합니다.
+
+    Args:
+        video_ids (List[str]): YouTube 동영상 ID 목록
+        parts (str): 요청할 part 목록 (쉼표 구분)
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 동영상 ID별 상세 정보 딕셔너리
+    """
+    unique_ids = list(dict.fromkeys(video_ids))
+    pages = [
+        unique_ids[i:i + VIDEOS_PAGE_SIZE]
+        for i in range(0, len(unique_ids), VIDEOS_PAGE_SIZE)
+    ]
+
+    async def fetch_page(page: List[str]) -> List[Dict[str, Any]]:
+        response = await http.request(
+            "youtube",
+            "GET",
+            f"{YOUTUBE_API_ENDPOINT}/videos",
+            endpoint="videos",
             params={
-                "part": "snippet",
-                "q": query,
+                "part": parts,
+                "id": ",".join(page),
                 "key": YOUTUBE_API_KEY,
-                "maxResults": max_results,
-                "type": "video"
             }
         )
-        response.raise_for_status()
-        
-        search_data = response.json()
-        
-        if "items" in search_data:
-            for video in search_data["items"]:
-                if "videoId" in video["id"]:
-                    video_id = video["id"]["videoId"]
-                    
-                    video_details = await get_video_details(video_id)
-                    video["detail"] = video_details
-                    
-                    video_transcript = await get_youtube_transcript(video_id)
-                    video["transcript"] = video_transcript
-        
-        return search_data
+        return response.json().get("items", [])
+
+    results = await asyncio.gather(*(fetch_page(page) for page in pages))
+    return {item["id"]: item for items in results for item in items}
 
 
 async def get_video_details(
@@ -63,17 +122,18 @@ async def get_video_details(
     Returns:
         str: 동영상 상세 정보 JSON 문자열
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://www.googleapis.com/youtube/v3/videos",
-            params={
-                "part": "snippet,statistics,contentDetails",
-                "id": video_id,
-                "key": YOUTUBE_API_KEY,
-            }
-        )
-        response.raise_for_status()
-        return response.text
+    response = await http.request(
+        "youtube",
+        "GET",
+        f"{YOUTUBE_API_ENDPOINT}/videos",
+        endpoint="videos",
+        params={
+            "part": "snippet,statistics,contentDetails",
+            "id": video_id,
+            "key": YOUTUBE_API_KEY,
+        }
+    )
+    return response.text
 
 
 async def get_youtube_transcript(
@@ -90,14 +150,15 @@ async def get_youtube_transcript(
         str: 자막 정보 (현재는 placeholder)
     """
     # TODO: 실제 자막 API 구현 필요 (youtube-transcript-api 등 사용)
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://www.googleapis.com/youtube/v3/videos",
-            params={
-                "part": "snippet",
-                "id": video_id,
-                "key": YOUTUBE_API_KEY,
-            }
-        )
-        response.raise_for_status()
-        return response.text
\ No newline at end of file
+    response = await http.request(
+        "youtube",
+        "GET",
+        f"{YOUTUBE_API_ENDPOINT}/videos",
+        endpoint="videos",
+        params={
+            "part": "snippet",
+            "id": video_id,
+            "key": YOUTUBE_API_KEY,
+        }
+    )
+    return response.text
\ No newline at end of file
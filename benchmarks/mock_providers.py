@@ -0,0 +1,267 @@
+"""
+네이버, 카카오, 구글, YouTube API를 대신하는 로컬 mock provider
+
+benchmarks/fixtures의 실제 응답 형식 payload를 바탕으로 요청 파라미터(query, start, display, 좌표)에 맞는
+응답을 만들어 httpx.MockTransport로 돌려줍니다. 응답 지연과 오류(429/503) 비율을 설정할 수 있습니다.
+"""
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import random
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# (host, path) -> (provider, endpoint)
+ROUTES = {
+    ("openapi.naver.com", "/v1/search/blog.json"): ("naver", "blog"),
+    ("openapi.naver.com", "/v1/search/local.json"): ("naver", "local"),
+    ("openapi.naver.com", "/v1/search/webkr.json"): ("naver", "webkr"),
+    ("dapi.kakao.com", "/v2/local/search/keyword.json"): ("kakao", "keyword"),
+    ("dapi.kakao.com", "/v2/local/search/category.json"): ("kakao", "category"),
+    ("dapi.kakao.com", "/v2/local/search/address.json"): ("kakao", "address"),
+    ("dapi.kakao.com", "/v2/search/web"): ("kakao", "web"),
+    ("apis-navi.kakaomobility.com", "/v1/waypoints/directions"): ("kakao", "directions"),
+    ("www.googleapis.com", "/customsearch/v1"): ("google", "customsearch"),
+    ("www.googleapis.com", "/youtube/v3/search"): ("youtube", "search"),
+    ("www.googleapis.com", "/youtube/v3/videos"): ("youtube", "videos"),
+}
+
+# 서울 중심부 (지오코딩 결과를 이 주변에 흩뿌림)
+_BASE_LAT, _BASE_LON = 37.5400, 127.0000
+# 경로 도로마다 만들 좌표 수 (실제 카카오 네비 응답처럼 촘촘한 경로를 흉내냄)
+_VERTEXES_PER_ROAD = 120
+
+
+def load_fixture(name: str) -> Dict[str, Any]:
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _seed(*parts: Any) -> int:
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _cycle(items: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    return [copy.deepcopy(items[index % len(items)]) for index in range(count)]
+
+
+class MockProviders:
+    """
+    provider API mock. transport 속성을 apis.http.install_transport()에 넘겨 사용합니다.
+
+    Args:
+        latency_ms (float): 평균 응답 지연 (밀리초)
+        jitter_ms (float): 응답 지연의 표준편차 (밀리초)
+        error_rate (float): 429 또는 503으로 응답할 확률 (0~1)
+        result_pool (int): 검색어마다 존재하는 결과 수 (네이버 페이지네이션의 마지막 페이지 결정)
+        seed (int): 지연/오류 난수 시드
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 80.0,
+        jitter_ms: float = 20.0,
+        error_rate: float = 0.0,
+        result_pool: int = 1000,
+        seed: int = 0
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.result_pool = result_pool
+        self.random = random.Random(seed)
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.bytes_out = 0
+        self.fixtures = {
+            name: load_fixture(name)
+            for name in (
+                "naver_blog", "naver_local", "naver_webkr", "kakao_keyword", "kakao_web",
+                "kakao_directions", "google_customsearch", "youtube_search", "youtube_videos",
+            )
+        }
+        self.transport = httpx.MockTransport(self.handle)
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.errors.clear()
+        self.bytes_out = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        route = ROUTES.get((request.url.host, request.url.path))
+        if route is None:
+            return httpx.Response(404, json={"errorMessage": f"no mock for {request.url}"})
+        self.calls[route] += 1
+
+        delay = max(0.0, self.random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors[route] += 1
+            if self.random.random() < 0.5:
+                return httpx.Response(429, headers={"Retry-After": "0"}, json={"errorCode": "012", "errorMessage": "Rate limit exceeded"})
+            return httpx.Response(503, json={"errorMessage": "Service Unavailable"})
+
+        provider, endpoint = route
+        payload = getattr(self, f"_{provider}_{endpoint}")(request)
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.bytes_out += len(body)
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json; charset=utf-8"})
+
+    # ---- Naver ----
+
+    def _naver_page(self, request: httpx.Request, fixture: str) -> Dict[str, Any]:
+        params = request.url.params
+        query = params.get("query", "")
+        start = int(params.get("start", 1))
+        display = int(params.get("display", 10))
+        count = max(0, min(display, self.result_pool - start + 1))
+        payload = copy.deepcopy(self.fixtures[fixture])
+        items = _cycle(payload["items"], count)
+        for offset, item in enumerate(items):
+            rank = start + offset
+            item["link"] = f"{item['link']}?q={_seed(query) % 100000}&n={rank}"
+            if "mapx" in item:
+                lat, lon = self._point(query, rank)
+                item["mapx"], item["mapy"] = str(int(lon * 1e7)), str(int(lat * 1e7))
+        payload.update({"items": items, "start": start, "display": len(items), "total": self.result_pool})
+        return payload
+
+    def _naver_blog(self, request: httpx.Request) -> Dict[str, Any]:
+        return self._naver_page(request, "naver_blog")
+
+    def _naver_local(self, request: httpx.Request) -> Dict[str, Any]:
+        return self._naver_page(request, "naver_local")
+
+    def _naver_webkr(self, request: httpx.Request) -> Dict[str, Any]:
+        return self._naver_page(request, "naver_webkr")
+
+    # ---- Kakao ----
+
+    def _point(self, query: str, rank: int = 0, center: Optional[Tuple[float, float]] = None, radius_m: float = 5000.0):
+        """검색어마다 항상 같은 좌표를 돌려주도록 검색어 해시로 좌표를 정합니다."""
+        rng = random.Random(_seed(query, rank, center))
+        lat0, lon0 = center if center else (_BASE_LAT, _BASE_LON)
+        spread = radius_m / 111_320.0
+        return lat0 + rng.uniform(-spread, spread) * 0.7, lon0 + rng.uniform(-spread, spread) * 0.7
+
+    def _kakao_places(self, request: httpx.Request, key: str) -> Dict[str, Any]:
+        params = request.url.params
+        center = None
+        if "x" in params and "y" in params:
+            center = (float(params["y"]), float(params["x"]))
+        radius = float(params.get("radius", 5000))
+        page = int(params.get("page", 1))
+        payload = copy.deepcopy(self.fixtures["kakao_keyword"])
+        size = int(params.get("size", 15))
+        documents = _cycle(payload["documents"], size)
+        for rank, document in enumerate(documents, start=(page - 1) * size):
+            lat, lon = self._point(key, rank, center, radius)
+            document["id"] = str(_seed(key, rank, center) % 10**10)
+            document["place_url"] = f"http://place.map.kakao.com/{document['id']}"
+            document["x"], document["y"] = f"{lon:.6f}", f"{lat:.6f}"
+        payload["documents"] = documents
+        payload["meta"]["is_end"] = page >= 3
+        return payload
+
+    def _kakao_keyword(self, request: httpx.Request) -> Dict[str, Any]:
+        return self._kakao_places(request, request.url.params.get("query", ""))
+
+    def _kakao_category(self, request: httpx.Request) -> Dict[str, Any]:
+        return self._kakao_places(request, request.url.params.get("category_group_code", ""))
+
+    def _kakao_address(self, request: httpx.Request) -> Dict[str, Any]:
+        query = request.url.params.get("query", "")
+        lat, lon = self._point(query)
+        return {
+            "documents": [{
+                "address_name": query, "address_type": "ROAD_ADDR",
+                "x": f"{lon:.6f}", "y": f"{lat:.6f}",
+                "address": {"address_name": query}, "road_address": {"address_name": query},
+            }],
+            "meta": {"is_end": True, "pageable_count": 1, "total_count": 1},
+        }
+
+    def _kakao_web(self, request: httpx.Request) -> Dict[str, Any]:
+        payload = copy.deepcopy(self.fixtures["kakao_web"])
+        query = request.url.params.get("query", "")
+        for rank, document in enumerate(payload["documents"]):
+            document["url"] = f"{document['url']}?q={_seed(query) % 100000}&n={rank}"
+        return payload
+
+    def _kakao_directions(self, request: httpx.Request) -> Dict[str, Any]:
+        """
+        녹화된 경로 모양을 요청한 출발지-목적지 좌표에 맞춰 옮기고,
+        도로마다 _VERTEXES_PER_ROAD개의 좌표로 촘촘하게 만듭니다.
+        """
+        body = json.loads(request.content or b"{}")
+        payload = copy.deepcopy(self.fixtures["kakao_directions"])
+        route = payload["routes"][0]
+        summary = route["summary"]
+        src = (summary["origin"]["x"], summary["origin"]["y"], summary["destination"]["x"], summary["destination"]["y"])
+        origin, destination = body.get("origin", {}), body.get("destination", {})
+        dst = (
+            float(origin.get("x", src[0])), float(origin.get("y", src[1])),
+            float(destination.get("x", src[2])), float(destination.get("y", src[3])),
+        )
+
+        def transform(x: float, y: float) -> Tuple[float, float]:
+            tx = (x - src[0]) / ((src[2] - src[0]) or 1.0)
+            ty = (y - src[1]) / ((src[3] - src[1]) or 1.0)
+            return dst[0] + tx * (dst[2] - dst[0]), dst[1] + ty * (dst[3] - dst[1])
+
+        rng = random.Random(_seed(dst, body.get("priority")))
+        for section in route["sections"]:
+            for road in section["roads"]:
+                points = [transform(*road["vertexes"][i:i + 2]) for i in range(0, len(road["vertexes"]), 2)]
+                vertexes = []
+                for (x1, y1), (x2, y2) in zip(points, points[1:]):
+                    steps = max(1, _VERTEXES_PER_ROAD // max(1, len(points) - 1))
+                    for step in range(steps):
+                        t = step / steps
+                        vertexes += [
+                            round(x1 + (x2 - x1) * t + rng.gauss(0, 2e-5), 7),
+                            round(y1 + (y2 - y1) * t + rng.gauss(0, 2e-5), 7),
+                        ]
+                vertexes += [round(points[-1][0], 7), round(points[-1][1], 7)]
+                road["vertexes"] = vertexes
+        summary["priority"] = body.get("priority", summary["priority"])
+        summary["origin"].update(x=dst[0], y=dst[1])
+        summary["destination"].update(x=dst[2], y=dst[3])
+        return payload
+
+    # ---- Google / YouTube ----
+
+    def _google_customsearch(self, request: httpx.Request) -> Dict[str, Any]:
+        payload = copy.deepcopy(self.fixtures["google_customsearch"])
+        params = request.url.params
+        query, start = params.get("q", ""), int(params.get("start", 1))
+        payload["items"] = _cycle(payload["items"], int(params.get("num", 10)))
+        for offset, item in enumerate(payload["items"]):
+            item["link"] = f"{item['link']}?q={_seed(query) % 100000}&n={start + offset}"
+        return payload
+
+    def _youtube_search(self, request: httpx.Request) -> Dict[str, Any]:
+        payload = copy.deepcopy(self.fixtures["youtube_search"])
+        query = request.url.params.get("q", "")
+        payload["items"] = _cycle(payload["items"], int(request.url.params.get("maxResults", 10)))
+        for rank, item in enumerate(payload["items"]):
+            item["id"]["videoId"] = f"{item['id']['videoId'][:6]}{_seed(query, rank) % 100000:05d}"
+        return payload
+
+    def _youtube_videos(self, request: httpx.Request) -> Dict[str, Any]:
+        payload = copy.deepcopy(self.fixtures["youtube_videos"])
+        ids = [video_id for video_id in request.url.params.get("id", "").split(",") if video_id]
+        items = _cycle(payload["items"], len(ids))
+        for video_id, item in zip(ids, items):
+            item["id"] = video_id
+        payload["items"] = items
+        payload["pageInfo"] = {"totalResults": len(items), "resultsPerPage": len(items)}
+        return payload
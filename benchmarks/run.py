@@ -0,0 +1,221 @@
+"""
+오프라인 도구 벤치마크
+
+server.py의 모든 도구를 로컬 mock provider(benchmarks/mock_providers.py)에 대해 실행하고
+도구별 p50/p99 지연 시간, N개 동시 클라이언트의 처리량, provider 엔드포인트별 upstream 호출 수를 출력합니다.
+네트워크나 API 키 없이 실행되므로 CI에서 성능 회귀를 확인하는 데 사용할 수 있습니다.
+
+사용법:
+    uv run python benchmarks/run.py
+    uv run python benchmarks/run.py --tools search_web search_local --concurrency 16 --requests 200
+    uv run python benchmarks/run.py --latency-ms 150 --error-rate 0.05 --json results.json --max-p99-ms 2000
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 서버 모듈을 불러오기 전에 설정해야 하는 값들 (이미 지정된 환경 변수는 그대로 사용)
+_BENCHMARK_ENV = {
+    "NAVER_CLIENT_ID": "benchmark",
+    "NAVER_CLIENT_SECRET": "benchmark",
+    "KAKAO_REST_API_KEY": "benchmark",
+    "GOOGLE_API_KEY": "benchmark",
+    "GOOGLE_SEARCH_ENGINE_ID": "benchmark",
+    "YOUTUBE_API_KEY": "benchmark",
+    # 디스크 캐시/사용량 파일을 건드리지 않도록 메모리만 사용
+    "GEOCODE_CACHE_PATH": "",
+    "GAZETTEER_PATH": "",
+    # Nominatim(geopy)은 mock transport를 거치지 않으므로 카카오 백엔드만 사용
+    "GEOCODER_BACKENDS": "kakao_address,kakao_keyword",
+    "QUOTA_STATE_PATH": "",
+    # 실제 provider 한도가 아니라 코드 경로의 성능을 측정하기 위해 한도를 넉넉하게 설정
+    "NAVER_RATE_PER_SEC": "100000",
+    "KAKAO_RATE_PER_SEC": "100000",
+    "GOOGLE_RATE_PER_SEC": "100000",
+    "YOUTUBE_RATE_PER_SEC": "100000",
+    "NAVER_DAILY_QUOTA": "100000000",
+    "KAKAO_DAILY_QUOTA": "100000000",
+    "GOOGLE_DAILY_QUOTA": "100000000",
+    "YOUTUBE_DAILY_QUOTA": "100000000",
+    "HTTP_BACKOFF_BASE": "0.01",
+    "HTTP_BACKOFF_MAX": "0.1",
+}
+
+# 각 도구에 넘길 인자 (i번째 요청, 검색어 풀 크기) -> arguments
+Scenario = Callable[[int, int], Dict[str, Any]]
+
+_PLACES = ["성수 카페", "서울숲", "뚝섬역", "건대입구역", "왕십리역", "한양대학교", "성수역", "서울숲 공원"]
+
+SCENARIOS: Dict[str, Scenario] = {
+    "search_review": lambda i, pool: {"query": f"카페 후기 {i % pool}"},
+    "search_local": lambda i, pool: {"query": f"성수 카페 {i % pool}"},
+    "search_web": lambda i, pool: {"query": f"카페 창업 {i % pool}"},
+    "search_web_paginated": lambda i, pool: {"query": f"카페 {i % pool}", "sites": ["naver"], "max_results": 300},
+    "search_batch": lambda i, pool: {
+        "queries": [f"성수 카페 {(i + offset) % pool}" for offset in range(10)],
+        "kind": "local",
+    },
+    "search_route_stops": lambda i, pool: {
+        "origin": f"강남역 {i % pool}",
+        "destination": f"잠실역 {i % pool}",
+        "stop_category": "주유소",
+    },
+    "search_route_compare": lambda i, pool: {
+        "origin": f"강남역 {i % pool}",
+        "destination": f"잠실역 {i % pool}",
+        "compare": True,
+    },
+    "places_to_map": lambda i, pool: {
+        "places": [f"{place} {i % pool}" for place in _PLACES],
+        "html_only": True,
+    },
+}
+
+# search_web_paginated, search_route_compare처럼 이름이 도구 이름과 다른 시나리오
+_TOOL_NAMES = {"search_web_paginated": "search_web", "search_route_compare": "search_route_stops"}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """nearest-rank 방식의 백분위수"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+async def run_scenario(
+    server: Any,
+    mock: Any,
+    name: str,
+    requests: int,
+    concurrency: int,
+    query_pool: int
+) -> Dict[str, Any]:
+    """시나리오 하나를 concurrency개의 MCP 클라이언트로 나눠 실행하고 결과를 집계합니다."""
+    from fastmcp import Client
+    from apis import cache, geocache
+
+    cache.response_cache.clear()
+    cache.route_cache.clear()
+    geocache.geocode_cache.clear()
+    mock.reset()
+
+    tool = _TOOL_NAMES.get(name, name)
+    scenario = SCENARIOS[name]
+    latencies: List[float] = []
+    errors: List[str] = []
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        async with Client(server.mcp) as client:
+            for index in counter:
+                start = time.perf_counter()
+                try:
+                    result = await client.call_tool(tool, scenario(index, query_pool), raise_on_error=False)
+                    if result.is_error:
+                        errors.append(result.content[0].text if result.content else "error")
+                except Exception as error:
+                    errors.append(f"{type(error).__name__}: {error}")
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    upstream = {f"{provider}.{endpoint}": count for (provider, endpoint), count in sorted(mock.calls.items())}
+    return {
+        "tool": name,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "upstream_calls": sum(upstream.values()),
+        "upstream_per_request": round(sum(upstream.values()) / max(len(latencies), 1), 2),
+        "upstream": upstream,
+        "upstream_errors_injected": sum(mock.errors.values()),
+        "upstream_bytes": mock.bytes_out,
+    }
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    header = f"{'tool':<22}{'req':>6}{'err':>5}{'p50 ms':>9}{'p99 ms':>9}{'req/s':>8}{'calls':>7}{'calls/req':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result['tool']:<22}{result['requests']:>6}{result['errors']:>5}"
+            f"{result['p50_ms']:>9.1f}{result['p99_ms']:>9.1f}{result['throughput_rps']:>8.1f}"
+            f"{result['upstream_calls']:>7}{result['upstream_per_request']:>10.2f}"
+        )
+    print()
+    for result in results:
+        calls = ", ".join(f"{endpoint}={count}" for endpoint, count in result["upstream"].items())
+        print(f"{result['tool']}: {calls}")
+        for sample in result["error_samples"]:
+            print(f"    error: {sample[:200]}")
+
+
+async def main_async(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    import mock_providers
+    from apis import http
+
+    mock = mock_providers.MockProviders(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    http.install_transport(mock.transport)
+
+    import server
+
+    results = []
+    for name in args.tools:
+        results.append(await run_scenario(server, mock, name, args.requests, args.concurrency, args.query_pool))
+    await http.aclose_clients()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tools", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS), help="실행할 시나리오")
+    parser.add_argument("--requests", type=int, default=100, help="시나리오별 요청 수 (기본값: 100)")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 MCP 클라이언트 수 (기본값: 8)")
+    parser.add_argument("--query-pool", type=int, default=25, help="서로 다른 검색어 수, 작을수록 캐시 적중이 늘어남 (기본값: 25)")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="mock provider 평균 응답 지연 (기본값: 80)")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="mock provider 응답 지연 표준편차 (기본값: 20)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock provider 429/503 응답 비율 (기본값: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--max-p99-ms", type=float, help="p99 지연 시간이 이 값을 넘는 도구가 있으면 실패 (exit 1)")
+    args = parser.parse_args()
+
+    for key, value in _BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
+
+    results = asyncio.run(main_async(args))
+    print_table(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as file:
+            json.dump({"args": vars(args), "results": results}, file, ensure_ascii=False, indent=2)
+
+    slow = [result["tool"] for result in results if args.max_p99_ms and result["p99_ms"] > args.max_p99_ms]
+    if slow:
+        print(f"FAIL: p99 > {args.max_p99_ms}ms: {', '.join(slow)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
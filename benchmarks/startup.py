@@ -0,0 +1,86 @@
+"""
+서버 cold start 시간 벤치마크
+
+새 파이썬 프로세스에서 `import server`와 첫 MCP 세션 시작(lifespan 진입과 initialize)에 걸리는 시간을
+여러 번 측정하고, 중앙값이 예산(--budget)을 넘거나 무거운 의존성이 시작 시점에 로드되면 실패(exit 1)합니다.
+
+사용법:
+    uv run python benchmarks/startup.py
+    uv run python benchmarks/startup.py --runs 20 --budget 1.2
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 시작 시점에 불러오면 안 되는 모듈 (처음 사용할 때 불러옴)
+LAZY_MODULES = ("folium", "geopy", "numpy", "pandas")
+
+_PROBE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import server
+elapsed = time.perf_counter() - start
+
+async def open_session():
+    from fastmcp import Client
+    started = time.perf_counter()
+    async with Client(server.mcp):
+        return time.perf_counter() - started
+
+session = asyncio.run(open_session())
+print(json.dumps({"import_s": elapsed, "session_s": session, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def measure_once() -> dict:
+    """새 프로세스에서 서버 모듈 import 시간, 첫 세션 시작 시간과 프로세스 전체 시간을 측정합니다."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1", PYTHONWARNINGS="ignore")
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_s"] = time.perf_counter() - start
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="측정 횟수 (기본값: 10)")
+    parser.add_argument("--budget", type=float, default=1.5, help="프로세스 시작 시간 중앙값 예산 (초, 기본값: 1.5)")
+    args = parser.parse_args()
+
+    measure_once()  # 바이트코드/파일 시스템 캐시 워밍업
+    runs = [measure_once() for _ in range(args.runs)]
+    import_times = [run["import_s"] for run in runs]
+    session_times = [run["session_s"] for run in runs]
+    process_times = [run["process_s"] for run in runs]
+    loaded = sorted({module for run in runs for module in run["loaded"]})
+
+    process_median = statistics.median(process_times)
+    print(f"import server   median {statistics.median(import_times):.3f}s  max {max(import_times):.3f}s")
+    print(f"first session   median {statistics.median(session_times):.3f}s  max {max(session_times):.3f}s")
+    print(f"process start   median {process_median:.3f}s  max {max(process_times):.3f}s  (budget {args.budget:.3f}s)")
+    if loaded:
+        print(f"eagerly loaded heavy modules: {', '.join(loaded)}")
+
+    if process_median > args.budget or loaded:
+        print("FAIL")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,223 @@
 import json
-from typing import List, Annotated, Optional, Dict
+import time
+from typing import Any, Awaitable, Callable, List, Annotated, Optional, Dict
 
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
-from apis import google, kakao, mapping, naver, youtube
+from apis import cache, coalesce, fanout, fusion, gazetteer, google, http, kakao, mapping, metrics, naver, paginate, quota, schema, youtube
 
-mcp = FastMCP("Multi-Platform Search API", dependencies=["httpx", "folium", "geopy"])
+mcp = FastMCP(
+    "Multi-Platform Search API",
+    dependencies=["httpx", "folium", "geopy"],
+    lifespan=http.lifespan,
+)
+
+
+class ToolMetricsMiddleware(Middleware):
+    """도구 호출마다 지연 시간과 성공/실패를 기록하고, 호출 전체를 root trace span으로 묶습니다."""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        tool = context.message.name
+        started = time.perf_counter()
+        status = "error"
+        with metrics.span("tool", root=True, tool=tool) as trace:
+            try:
+                result = await call_next(context)
+                status = "error" if getattr(result, "is_error", False) else "ok"
+                return result
+            finally:
+                metrics.record_tool(tool, status, time.perf_counter() - started)
+                if trace is not None:
+                    trace.attributes["status"] = status
+
+
+mcp.add_middleware(ToolMetricsMiddleware())
+
+def _outcomes_payload(
+    outcomes: Dict[str, Dict[str, Any]],
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    provider별 fan-out 결과를 응답 딕셔너리로 변환합니다.
+    성공한 provider는 {"status": "ok", "items": [...]}, 실패한 provider는 {"status", "error"}로 표시합니다.
+    여러 페이지 중 일부만 실패한 provider는 {"status": "partial", "items", "error", "failed_pages"}로 표시합니다.
+    """
+    payload = {}
+    for site, outcome in outcomes.items():
+        if outcome["status"] == "ok":
+            payload[site] = {
+                "status": "ok",
+                "items": [schema.to_dict(item, fields) for item in outcome["result"]],
+            }
+            failed_pages = getattr(outcome["result"], "failed_pages", None)
+            if failed_pages:
+                payload[site].update(
+                    status="partial",
+                    error=next(iter(failed_pages.values())),
+                    failed_pages=sorted(failed_pages),
+                )
+        else:
+            payload[site] = outcome
+    return payload
+
+
+def _merged_payload(
+    outcomes: Dict[str, Dict[str, Any]],
+    items: List[Any],
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    provider 결과를 병합한 목록을 응답 딕셔너리로 변환합니다.
+    provider별 상태는 "status"에, 실패한 provider의 오류는 "errors"에 담습니다.
+    """
+    payload = {
+        "status": {site: outcome["status"] for site, outcome in outcomes.items()},
+        "items": [schema.to_dict(item, fields) for item in items],
+    }
+    errors = {site: outcome["error"] for site, outcome in outcomes.items() if "error" in outcome}
+    if errors:
+        payload["errors"] = errors
+    return payload
+
+
+async def _parsed(call: Awaitable[Any], parser: Callable[[Any], List[Any]]) -> List[Any]:
+    """provider 응답을 기다린 뒤 정규화된 결과 목록으로 변환합니다."""
+    return parser(await call)
+
+
+def _progress_reporter(
+    ctx: Optional[Context],
+    site: str,
+    max_results: int,
+    fields: Optional[List[str]] = None
+) -> paginate.OnPage:
+    """
+    페이지가 도착할 때마다 새로 추가된 결과를 MCP progress 알림의 message로 전달하는 콜백을 만듭니다.
+    MCP progress 값은 알림마다 증가해야 하므로 고유 결과 수가 늘어난 페이지만 알립니다.
+    클라이언트가 progressToken을 보내지 않으면 알림은 생략됩니다.
+    """
+    reported = 0
+
+    async def on_page(start: int, items: List[Any], collected: int) -> None:
+        nonlocal reported
+        progress = min(collected, max_results)
+        if ctx is None or progress <= reported:
+            return
+        reported = progress
+        message = schema.dumps({
+            "site": site,
+            "start": start,
+            "items": [schema.to_dict(item, fields) for item in items],
+        })
+        await ctx.report_progress(progress, max_results, message)
+
+    return on_page
+
+
+async def _search_review(
+    query: str,
+    display: int,
+    start: int,
+    sort: str,
+    sites: List[str],
+    youtube_enrich: str,
+    fields: Optional[List[str]] = None,
+    max_results: Optional[int] = None,
+    ctx: Optional[Context] = None,
+) -> Dict[str, Any]:
+    """search_review 도구의 검색 본문. provider별 결과 딕셔너리를 반환합니다."""
+    calls = {}
+
+    if "naver" in sites and max_results:
+        calls["naver"] = paginate.fetch_pages(
+            lambda page_start, page_size: _parsed(
+                naver.search_blog_naver(query, page_size, page_start, sort), schema.parse_naver_blog
+            ),
+            max_results,
+            key=lambda post: post.url,
+            start=start,
+            on_page=_progress_reporter(ctx, "naver", max_results, fields),
+        )
+    elif "naver" in sites:
+        calls["naver"] = _parsed(
+            naver.search_blog_naver(query, display, start, sort), schema.parse_naver_blog
+        )
+
+    if "youtube" in sites:
+        calls["youtube"] = _parsed(
+            youtube.search_videos_youtube(query, display, youtube_enrich), schema.parse_youtube_videos
+        )
+
+    return _outcomes_payload(await fanout.gather_providers(calls), fields)
+
+
+async def _search_local(
+    query: str,
+    display: int,
+    start: int,
+    sort: str,
+    sites: List[str],
+    fields: Optional[List[str]] = None,
+    merge: bool = True,
+) -> Dict[str, Any]:
+    """search_local 도구의 검색 본문. 병합된(merge=False면 provider별) 결과 딕셔너리를 반환합니다."""
+    calls = {}
+
+    if "naver" in sites:
+        calls["naver"] = _parsed(
+            naver.search_local_naver(query, display, start, sort), schema.parse_naver_local
+        )
+
+    if "kakao" in sites:
+        calls["kakao"] = _parsed(kakao.search_local_kakao(query), schema.parse_kakao_local)
+
+    outcomes = await fanout.gather_providers(calls)
+    if not merge:
+        return _outcomes_payload(outcomes, fields)
+
+    places = [
+        place
+        for outcome in outcomes.values() if outcome["status"] == "ok"
+        for place in outcome["result"]
+    ]
+    return _merged_payload(outcomes, fusion.fuse_places(places), fields)
+
+
+async def _search_web(
+    query: str,
+    display: int,
+    start: int,
+    sites: List[str],
+    fields: Optional[List[str]] = None,
+    max_results: Optional[int] = None,
+    ctx: Optional[Context] = None,
+) -> Dict[str, Any]:
+    """search_web 도구의 검색 본문. provider별 결과 딕셔너리를 반환합니다."""
+    calls = {}
+
+    if "naver" in sites and max_results:
+        calls["naver"] = paginate.fetch_pages(
+            lambda page_start, page_size: _parsed(
+                naver.search_web_naver(query, page_size, page_start), schema.parse_naver_web
+            ),
+            max_results,
+            key=lambda doc: doc.url,
+            start=start,
+            on_page=_progress_reporter(ctx, "naver", max_results, fields),
+        )
+    elif "naver" in sites:
+        calls["naver"] = _parsed(naver.search_web_naver(query, display, start), schema.parse_naver_web)
+
+    if "kakao" in sites:
+        calls["kakao"] = _parsed(kakao.search_web_kakao(query), schema.parse_kakao_web)
+
+    if "google" in sites:
+        calls["google"] = _parsed(google.search_web_google(query, display, start), schema.parse_google_web)
+
+    return _outcomes_payload(await fanout.gather_providers(calls), fields)
 
 
 @mcp.tool(
@@ -18,10 +230,14 @@ async def search_review(
     start: int = 1,
     sort: str = "sim",
     sites: List[str] = ["naver", "youtube"],
+    youtube_enrich: str = "full",
+    fields: Optional[List[str]] = None,
+    max_results: Optional[int] = None,
+    ctx: Optional[Context] = None,
 ):
     """
     네이버 블로그 포스트와 YouTube 동영상을 검색합니다.
-    YouTube 검색 시 동영상 상세 정보와 자막 정보도 함께 포함됩니다.
+    YouTube 검색 시 동영상 상세 정보도 한 번의 일괄 요청으로 함께 포함됩니다.
 
     Args:
         query (str): 검색할 키워드나 문구
@@ -29,21 +245,17 @@ async def search_review(
         start (int): 검색 시작 위치 (기본값: 1, 최대: 1000)
         sort (str): 정렬 방법 - "sim"(정확도순), "date"(최신순) (기본값: "sim")
         sites (List[str]): 검색할 사이트 목록 ["naver", "youtube"]
+        youtube_enrich (str): YouTube 상세 정보 수준 - "none", "stats", "full" (기본값: "full")
+        fields (List[str], optional): 결과에 포함할 속성 목록 (예: ["title", "url"])
+        max_results (int, optional): 네이버 블로그에서 모을 결과 수 (최대 1000).
+            지정하면 필요한 페이지를 동시에 요청하고, 페이지마다 progress 알림으로 결과를 먼저 보냅니다.
 
     Returns:
-        str: 검색 결과 JSON 문자열
+        str: provider별 검색 결과 compact JSON 문자열
     """
-    response_parts = []
-
-    if "naver" in sites:
-        naver_result = await naver.search_blog_naver(query, display, start, sort)
-        response_parts.append(f"Naver: {naver_result}")
-
-    if "youtube" in sites:
-        youtube_result = await youtube.search_videos_youtube(query, display)
-        response_parts.append(f"Youtube: {json.dumps(youtube_result, ensure_ascii=False, indent=4)}")
-
-    return "\n".join(response_parts)
+    return schema.dumps(await _search_review(
+        query, display, start, sort, sites, youtube_enrich, fields, max_results, ctx
+    ))
 
 @mcp.tool(
     name="search_local",
@@ -54,7 +266,9 @@ async def search_local(
     display: int = 10,
     start: int = 1,
     sort: str = "random",
-    sites: List[str] = ["naver", "kakao"]
+    sites: List[str] = ["naver", "kakao"],
+    fields: Optional[List[str]] = None,
+    merge: bool = True,
 ):
     """
     네이버와 카카오 지역 서비스에서 지역별 업체 및 상호를 검색합니다.
@@ -66,21 +280,13 @@ async def search_local(
         start (int): 검색 시작 위치 (기본값: 1, 최대: 1000)
         sort (str): 정렬 방법 - "random"(랜덤순), "comment"(리뷰순), "count"(방문자순)
         sites (List[str]): 검색할 사이트 목록 ["naver", "kakao"]
+        fields (List[str], optional): 결과에 포함할 속성 목록 (예: ["name", "phone"])
+        merge (bool): provider 간 같은 장소를 하나로 병합할지 여부 (기본값: True)
 
     Returns:
-        str: 지역 검색 결과 JSON 문자열
+        str: 지역 검색 결과 compact JSON 문자열
     """
-    response_parts = []
-
-    if "naver" in sites:
-        naver_result = await naver.search_local_naver(query, display, start, sort)
-        response_parts.append(f"Naver: {naver_result}")
-
-    if "kakao" in sites:
-        kakao_result = await kakao.search_local_kakao(query)
-        response_parts.append(f"Kakao: {kakao_result}")
-
-    return "\n".join(response_parts)
+    return schema.dumps(await _search_local(query, display, start, sort, sites, fields, merge))
 
 @mcp.tool(
     name="search_web",
@@ -91,6 +297,9 @@ async def search_web(
     display: int = 10,
     start: int = 1,
     sites: List[str] = ["naver", "kakao", "google"],
+    fields: Optional[List[str]] = None,
+    max_results: Optional[int] = None,
+    ctx: Optional[Context] = None,
 ):
     """
     네이버, 카카오, 구글에서 웹 문서를 검색합니다.
@@ -101,25 +310,81 @@ async def search_web(
         display (int): 한 번에 표시할 검색 결과 개수 (기본값: 10, 최대: 100)
         start (int): 검색 시작 위치 (기본값: 1, 최대: 1000)
         sites (List[str]): 검색할 사이트 목록 ["naver", "kakao", "google"]
+        fields (List[str], optional): 결과에 포함할 속성 목록 (예: ["title", "url"])
+        max_results (int, optional): 네이버 웹 문서에서 모을 결과 수 (최대 1000).
+            지정하면 필요한 페이지를 동시에 요청하고, 페이지마다 progress 알림으로 결과를 먼저 보냅니다.
 
     Returns:
-        str: 웹 검색 결과 JSON 문자열
+        str: provider별 웹 검색 결과 compact JSON 문자열
     """
-    response_parts = []
+    return schema.dumps(await _search_web(query, display, start, sites, fields, max_results, ctx))
 
-    if "naver" in sites:
-        naver_result = await naver.search_web_naver(query, display, start)
-        response_parts.append(f"Naver: {naver_result}")
+@mcp.tool(
+    name="search_batch",
+    description="Run the same kind of search (local business info, reviews, or web) for many queries in one call, e.g. to compare 30 restaurants. Duplicate queries are searched once and a failing query does not fail the batch. Prefer this over calling search_local, search_review or search_web repeatedly.",
+)
+async def search_batch(
+    queries: List[str],
+    kind: str = "local",
+    display: int = 5,
+    sites: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
+    concurrency: int = fanout.BATCH_CONCURRENCY,
+):
+    """
+    여러 검색어를 한 번에 검색합니다.
+    정규화했을 때 같은 검색어는 한 번만 검색하고, 최대 concurrency개의 검색어를 동시에 진행합니다.
+    모든 검색은 같은 응답 캐시, 요청 병합, rate limiter를 공유하며 검색어별 오류는 errors에 따로 담습니다.
 
-    if "kakao" in sites:
-        kakao_result = await kakao.search_web_kakao(query)
-        response_parts.append(f"Kakao: {kakao_result}")
+    Args:
+        queries (List[str]): 검색어 목록 (최대 BATCH_MAX_QUERIES개)
+        kind (str): 검색 종류 - "local"(search_local), "review"(search_review), "web"(search_web)
+        display (int): 검색어별 provider 결과 개수 (기본값: 5)
+        sites (List[str], optional): 검색할 사이트 목록 (기본값: 검색 종류별 도구의 기본값)
+        fields (List[str], optional): 결과에 포함할 속성 목록 (예: ["name", "address"])
+        concurrency (int): 동시에 진행할 검색어 수 (기본값: 4)
 
-    if "google" in sites:
-        google_result = await google.search_web_google(query, display, start)
-        response_parts.append(f"Google: {google_result}")
+    Returns:
+        str: {"kind", "results": {검색어: 결과}, "errors": {검색어: 오류}, "duplicates": {검색어: 대표 검색어}}
+            compact JSON 문자열 (errors, duplicates는 해당 항목이 있을 때만 포함)
+    """
+    searches = {
+        "local": lambda query: _search_local(query, display, 1, "random", sites or ["naver", "kakao"], fields),
+        # 비교용 요약이므로 YouTube 상세 정보는 통계만 포함
+        "review": lambda query: _search_review(query, display, 1, "sim", sites or ["naver", "youtube"], "stats", fields),
+        "web": lambda query: _search_web(query, display, 1, sites or ["naver", "kakao", "google"], fields),
+    }
+    if kind not in searches:
+        raise ValueError(f"kind must be one of {list(searches)}")
+    if len(queries) > fanout.BATCH_MAX_QUERIES:
+        raise ValueError(f"queries can contain at most {fanout.BATCH_MAX_QUERIES} items")
 
-    return "\n".join(response_parts)
+    # 응답 캐시와 같은 기준으로 정규화하여 같은 캐시 항목을 쓰는 검색어는 한 번만 검색
+    canonical: Dict[str, str] = {}
+    duplicates: Dict[str, str] = {}
+    for query in queries:
+        key = cache.normalize_query(query)
+        if key not in canonical:
+            canonical[key] = query
+        elif canonical[key] != query:
+            duplicates[query] = canonical[key]
+
+    search = searches[kind]
+    outcomes = await fanout.gather_batch(
+        {query: (lambda query=query: search(query)) for query in canonical.values()},
+        concurrency,
+    )
+
+    payload: Dict[str, Any] = {
+        "kind": kind,
+        "results": {query: outcome["result"] for query, outcome in outcomes.items() if outcome["status"] == "ok"},
+    }
+    errors = {query: outcome["error"] for query, outcome in outcomes.items() if outcome["status"] != "ok"}
+    if errors:
+        payload["errors"] = errors
+    if duplicates:
+        payload["duplicates"] = duplicates
+    return schema.dumps(payload)
 
 @mcp.tool(
     name="search_route_stops",
@@ -129,11 +394,21 @@ async def search_route_stops(
     origin: Annotated[str, "출발지의 이름"],
     destination: Annotated[str, "도착지의 이름"],
     way_points: Annotated[List[str], "경유지의 이름"] = None,
-    priority: Annotated[str, "탐색 우선 순위 옵션"] = "RECOMMEND"
+    priority: Annotated[str, "탐색 우선 순위 옵션"] = "RECOMMEND",
+    tolerance_m: Annotated[float, "경로 좌표 단순화 허용 오차 (미터)"] = kakao.ROUTE_SIMPLIFY_TOLERANCE_M,
+    stop_query: Annotated[Optional[str], "경로 주변에서 찾을 장소 키워드 (예: 휴게소)"] = None,
+    stop_category: Annotated[Optional[str], "경로 주변에서 찾을 카카오 카테고리 (예: OL7, 주유소, 카페)"] = None,
+    corridor_m: Annotated[float, "경로에서 허용하는 최대 거리 (미터)"] = 1000.0,
+    max_stops: Annotated[int, "반환할 최대 장소 수"] = 20,
+    compare: Annotated[bool, "RECOMMEND/TIME/DISTANCE 경로를 한 번에 비교"] = False,
 ):
     """
     출발지, 목적지와 경유지를 입력하면 좌표로 변환 후
     카카오 네비를 통하여 경유지를 포함한 정제된 경로 정보를 반환합니다.
+    stop_query 또는 stop_category가 주어지면 경로를 따라 주변 장소를 동시에 검색하여
+    경로에서 가까운(우회 거리가 짧은) 순으로 함께 반환합니다.
+    compare가 True이면 지오코딩을 한 번만 하고 RECOMMEND, TIME, DISTANCE 경로를 동시에 요청하여
+    우선 순위별 거리, 시간, 통행료, 택시 요금과 단순화된 경로 좌표를 나란히 반환합니다 (priority와 경로 주변 검색은 무시).
 
     Args:
         origin (str): 출발지의 이름
@@ -143,14 +418,47 @@ async def search_route_stops(
             - RECOMMEND: 추천 경로
             - TIME: 최단 시간
             - DISTANCE: 최단 경로
+        tolerance_m (float): 경로 좌표 단순화 허용 오차 (미터)
+        stop_query (str, optional): 경로 주변에서 찾을 장소 키워드
+        stop_category (str, optional): 경로 주변에서 찾을 카카오 카테고리 코드 또는 별칭
+        corridor_m (float): 경로에서 허용하는 최대 거리 (미터)
+        max_stops (int): 반환할 최대 장소 수
+        compare (bool): 경로 우선 순위 비교 모드 사용 여부
 
     Returns:
-        str: 정제된 경로 정보 문자열
+        str: 경로 요약, 구간별 거리/시간, 단순화된 경로 좌표와 경로 주변 장소(stops) JSON 문자열.
+            경로가 길어 출발지부터 일부 구간만 검색했으면 stops_searched_m에 검색한 거리를 담습니다
+            (compare 모드에서는 우선 순위별 비교 결과 routes)
     """
     if way_points is None:
         way_points = []
-        
-    return await kakao.get_refined_route_info(origin, destination, way_points, priority)
+
+    if compare:
+        return schema.dumps(await kakao.compare_routes(
+            origin, destination, way_points, tolerance_m=tolerance_m
+        ))
+
+    if not (stop_query or stop_category):
+        return await kakao.get_refined_route_info(origin, destination, way_points, priority, tolerance_m)
+
+    # 경로 주변 검색(NumPy)은 필요할 때만 불러옵니다.
+    from apis import corridor
+
+    response_text = await kakao.find_route_kakao(origin, destination, way_points, priority)
+    route = kakao.refine_route(response_text, priority, tolerance_m)
+    if "error" not in route:
+        stops = await corridor.search_along_route(
+            corridor.route_polyline(route),
+            query=stop_query,
+            category=stop_category,
+            corridor_m=corridor_m,
+            max_stops=max_stops,
+        )
+        route["stops"] = stops["stops"]
+        if stops["searched_m"] < stops["route_m"]:
+            # 샘플 수 제한으로 경로 뒷부분을 검색하지 못한 경우
+            route["stops_searched_m"] = stops["searched_m"]
+    return schema.dumps(route)
 
 @mcp.tool(
     name="places_to_map",
@@ -165,6 +473,11 @@ async def places_to_map(
     save_to: Optional[str] = None,  # optional output filepath; if None, saves to /tmp
     cluster_markers: bool = True,
     html_only: bool = False,  # if True, return only HTML content without saving file
+    bbox: Optional[Dict[str, float]] = None,
+    polygon: Optional[List[List[float]]] = None,
+    exact_distance: bool = False,
+    render_mode: str = "auto",
+    open_browser: bool = False,
 ) -> str:
     """
     장소 이름 리스트를 입력하면 좌표로 변환 후 지도를 생성합니다.
@@ -178,6 +491,14 @@ async def places_to_map(
         save_to (str, optional): 지도 저장 경로 (None일 경우 /tmp에 저장)
         cluster_markers (bool): 마커 클러스터링 활성화 여부
         html_only (bool): HTML 파일만 반환 여부
+        bbox (Dict[str, float], optional): 표시할 영역 {"south", "west", "north", "east"}
+        polygon (List[List[float]], optional): 표시할 다각형 영역 [[위도, 경도], ...]
+        exact_distance (bool): 반경 필터에 측지선 거리(geodesic)를 사용할지 여부
+        render_mode (str): 마커 렌더링 방식
+            - auto: 장소가 많으면(기본 500개 초과) 대용량 모드로 자동 전환
+            - markers: 장소마다 마커와 팝업 객체 생성
+            - fast: 마커와 팝업을 브라우저에서 생성 (HTML 크기와 렌더링 시간 감소)
+        open_browser (bool): 저장한 지도를 서버가 실행 중인 PC의 브라우저로 열지 여부
 
     Returns:
         str: 지도 HTML 문자열
@@ -190,8 +511,57 @@ async def places_to_map(
         zoom_start,
         save_to,
         cluster_markers,
-        html_only
+        html_only,
+        bbox,
+        polygon,
+        exact_distance,
+        render_mode,
+        open_browser,
+    )
+
+@mcp.resource(
+    "stats://cache",
+    name="cache_stats",
+    description="Hit/miss counters of the provider response cache, route cache, request coalescing and offline gazetteer, and daily quota usage per provider.",
+    mime_type="application/json",
+)
+def cache_stats() -> str:
+    """응답 캐시, 경로 캐시, 요청 병합(single-flight), 장소명 사전 카운터와 provider별 일일 사용량을 JSON 문자열로 반환합니다."""
+    return json.dumps(
+        {
+            "response_cache": cache.response_cache.stats(),
+            "route_cache": cache.route_cache.stats(),
+            "single_flight": coalesce.single_flight.stats(),
+            "gazetteer": gazetteer.gazetteer.stats(),
+            "quota": quota.quota_manager.stats(),
+        },
+        ensure_ascii=False,
     )
 
+@mcp.resource(
+    "stats://metrics",
+    name="metrics",
+    description="Upstream latency percentiles, status codes, retries and bytes per provider endpoint, tool latencies, and cache/coalescing hit rates.",
+    mime_type="application/json",
+)
+def metrics_snapshot() -> str:
+    """provider 엔드포인트별/도구별 지연 시간 분위수, 상태 코드, 재시도, 바이트 수와 캐시 적중률을 JSON 문자열로 반환합니다."""
+    return json.dumps(metrics.snapshot(), ensure_ascii=False)
+
+@mcp.resource(
+    "stats://traces",
+    name="traces",
+    description="Most recent tool-call traces broken down into upstream requests (requires TRACING_ENABLED=true).",
+    mime_type="application/json",
+)
+def recent_traces() -> str:
+    """최근 도구 호출 trace(도구 span과 하위 upstream 요청 span)를 JSON 문자열로 반환합니다."""
+    return json.dumps(list(metrics.recent_traces), ensure_ascii=False)
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request: Request) -> PlainTextResponse:
+    """HTTP transport로 실행할 때 Prometheus가 수집할 수 있는 /metrics 엔드포인트"""
+    return PlainTextResponse(metrics.prometheus_text(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     mcp.run()